@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+EMPTY_SUMMARY = {
+    "property_count": 0,
+    "portfolio_value": 0,
+    "post_count": 0,
+    "total_likes": 0,
+    "total_comments": 0,
+}
+
+
+class UserAggregates:
+    """
+    Running per-user totals over owned properties and authored posts.
+
+    Every write adjusts the affected user's counters by the record's
+    contribution, so a profile summary is a dict lookup rather than scans
+    of the property and post catalogs.
+    """
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def _bump(self, user_id: str, **deltas: int) -> None:
+        totals = self._totals.get(user_id)
+        if totals is None:
+            totals = self._totals[user_id] = dict(EMPTY_SUMMARY)
+        for key, delta in deltas.items():
+            totals[key] += delta
+
+    def add_property(self, prop: Dict[str, Any]) -> None:
+        self._bump(prop["owner_id"], property_count=1, portfolio_value=prop["price"])
+
+    def remove_property(self, prop: Dict[str, Any]) -> None:
+        self._bump(prop["owner_id"], property_count=-1, portfolio_value=-prop["price"])
+
+    def add_post(self, post: Dict[str, Any]) -> None:
+        self._bump(post["author"], post_count=1,
+                   total_likes=post.get("likes", 0), total_comments=post.get("comments", 0))
+
+    def remove_post(self, post: Dict[str, Any]) -> None:
+        self._bump(post["author"], post_count=-1,
+                   total_likes=-post.get("likes", 0), total_comments=-post.get("comments", 0))
+
+    def add_engagement(self, user_id: str, likes: int = 0, comments: int = 0) -> None:
+        """Account for likes/comments landing on an existing post"""
+        self._bump(user_id, total_likes=likes, total_comments=comments)
+
+    def summary(self, user_id: str) -> Dict[str, int]:
+        return dict(self._totals.get(user_id, EMPTY_SUMMARY))
@@ -0,0 +1,137 @@
+from typing import Any, Dict, Hashable, Iterable, List, Set, Tuple
+
+from facets import PRICE_BANDS, price_band
+from filters import PROPERTY_TYPE_ALIASES, Predicate, compile_filters, price_bounds
+from ranking import tokenize
+
+AnchorKey = Tuple[Hashable, ...]
+WILDCARD: AnchorKey = ("*",)
+# Text anchors are character n-grams: a listing whose field contains a
+# needle as a substring necessarily contains every n-gram of that needle
+GRAM = 3
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _text_anchor(field: str, needle: str) -> List[AnchorKey]:
+    """One n-gram anchor for a substring predicate, taken from the needle's longest word"""
+    words = tokenize(needle)
+    longest = max(words, key=len) if words else needle
+    source = longest if len(longest) >= GRAM else needle
+    return [(field, source[:GRAM])] if len(source) >= GRAM else []
+
+
+def _bands_between(low, high) -> List[str]:
+    """Labels of every price band overlapping the inclusive range [low, high]"""
+    return [
+        label for band_low, band_high, label in PRICE_BANDS
+        if (high is None or band_low <= high) and (low is None or band_high is None or low < band_high)
+    ]
+
+
+def property_keys(prop: Dict[str, Any]) -> List[AnchorKey]:
+    """Every anchor key a listing can satisfy; saved searches are looked up under these"""
+    keys = [WILDCARD, ("bedrooms", prop["bedrooms"]), ("price", price_band(prop["price"]))]
+    keys.extend(("type", gram) for gram in _grams(prop["property_type"].lower()))
+    keys.extend(("location", gram) for gram in _grams(prop["location"].lower()))
+    return keys
+
+
+def search_keys(entities: Dict[str, Any]) -> List[AnchorKey]:
+    """
+    Anchor keys for a saved search, from its most selective constraint.
+
+    Any listing the search matches produces at least one of the returned
+    keys, so the search only has to be indexed under those. Locations and
+    types are substring predicates, so they anchor on an n-gram of the
+    same needle the predicate tests ("house" also finds "Farmhouse").
+    """
+    location = entities.get("location")
+    if location:
+        anchor = _text_anchor("location", str(location).lower())
+        if anchor:
+            return anchor
+
+    property_type = entities.get("property_type")
+    if property_type:
+        needle = str(property_type).lower()
+        anchor = _text_anchor("type", PROPERTY_TYPE_ALIASES.get(needle, needle))
+        if anchor:
+            return anchor
+
+    if "bedrooms" in entities:
+        try:
+            return [("bedrooms", int(entities["bedrooms"]))]
+        except (TypeError, ValueError):
+            pass
+
+    low, high = price_bounds(entities)
+    if low is not None or high is not None:
+        return [("price", label) for label in _bands_between(low, high)]
+
+    return [WILDCARD]
+
+
+class SavedSearchIndex:
+    """
+    Reverse (percolator) index of saved searches.
+
+    Instead of re-running every saved search whenever a listing arrives,
+    each search is filed under a few anchor keys derived from its entities.
+    A new listing collects the searches filed under its own keys and only
+    those candidates are checked with their compiled predicates.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[AnchorKey, Set[str]] = {}
+        self._searches: Dict[str, Tuple[List[AnchorKey], List[Predicate]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._searches)
+
+    def __contains__(self, search_id: str) -> bool:
+        return search_id in self._searches
+
+    def add(self, search_id: str, entities: Dict[str, Any], extra: Iterable[Predicate] = (),
+            keys: Iterable[AnchorKey] = ()) -> None:
+        """
+        File a search under its anchor keys.
+
+        ``extra`` predicates are checked alongside the entity filters; pass
+        ``keys`` to override the anchors when some entities are not plain
+        filters (e.g. a location that is really a landmark radius).
+        """
+        self.remove(search_id)
+        anchors = list(keys) or search_keys(entities)
+        predicates = compile_filters(entities) + list(extra)
+        self._searches[search_id] = (anchors, predicates)
+        for key in anchors:
+            self._buckets.setdefault(key, set()).add(search_id)
+
+    def remove(self, search_id: str) -> None:
+        entry = self._searches.pop(search_id, None)
+        if entry is None:
+            return
+        for key in entry[0]:
+            members = self._buckets.get(key)
+            if members is not None:
+                members.discard(search_id)
+                if not members:
+                    del self._buckets[key]
+
+    def candidates(self, prop: Dict[str, Any]) -> Set[str]:
+        found: Set[str] = set()
+        for key in property_keys(prop):
+            members = self._buckets.get(key)
+            if members:
+                found |= members
+        return found
+
+    def match(self, prop: Dict[str, Any]) -> List[str]:
+        """Ids of the saved searches a listing satisfies"""
+        return [
+            search_id for search_id in self.candidates(prop)
+            if all(pred(prop) for pred in self._searches[search_id][1])
+        ]
@@ -1,15 +1,47 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi import Header
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List, Optional, Union
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from prototype_db import sample_users, sample_posts, sample_properties
 from fastapi import FastAPI, Query
 from fastapi import FastAPI, Body
-from search import get_query_parser
+import nlp
+from metrics import REGISTRY, CONTENT_TYPE_LATEST, MetricsMiddleware
+from compression import CompressionMiddleware
+from projection import FieldProjector
+from bulk import BULK_MAX_ITEMS, batch_results, validate_batch
+from filters import apply_filters, compile_filters
+from ranking import BM25Index
+from facets import FacetIndex
+from typeahead import SuggestionTrie, normalize as normalize_suggestion
+from gazetteer import KENYAN_LOCATIONS, KENYAN_UNIVERSITIES
+from fuzzy import SymSpellIndex
+from geo import GridIndex, haversine_km, resolve_landmark
+from result_cache import CatalogVersion, FilterResultCache, filter_key
+from store import PropertyStore
+from records import NULLABLE_FIELDS, to_dicts
+from similarity import SimilarityIndex
+from alerts import SavedSearchIndex, search_keys
+from collections import deque
+from aggregates import UserAggregates
+from orderings import PostOrders
+from timeindex import TimeIndex, bound_to_epoch, in_range
+from wal import WriteAheadLog, replay as replay_log
+from events import CREATED_EVENTS, Broadcaster
+from singleflight import SingleFlight
+from synthetic import SyntheticCatalog, batched
+from itertools import islice
+from logconfig import LOGGER_NAME, configure_logging, shutdown_logging
+import asyncio
+import logging
+import os
 import re
 app = FastAPI(title="Test API", version="1.0.0")
+logger = logging.getLogger(LOGGER_NAME)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,6 +50,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+app.add_middleware(MetricsMiddleware)
 
 
 class User(BaseModel):
@@ -58,10 +92,48 @@ class Property(BaseModel):
     owner_id: str
     created_at: str
     image: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+class CreatePropertyRequest(BaseModel):
+    title: str
+    description: str
+    price: int
+    location: str
+    bedrooms: int
+    bathrooms: int
+    square_feet: int
+    property_type: str
+    year_built: int
+    owner_id: str
+    image: str = ""
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+
+class UpdatePropertyRequest(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[int] = None
+    location: Optional[str] = None
+    bedrooms: Optional[int] = None
+    bathrooms: Optional[int] = None
+    square_feet: Optional[int] = None
+    property_type: Optional[str] = None
+    year_built: Optional[int] = None
+    owner_id: Optional[str] = None
+    image: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
 class CreateUserRequest(BaseModel):
     name: str
     email: str
+    role: str = "user"
+    avatar: str = ""
+    bio: str = ""
+    location: str = ""
+    phone: str = ""
 
 
 
@@ -69,16 +141,427 @@ class CreatePostRequest(BaseModel):
     title: str
     content: str
     author: str
+    image: str = ""
+    category: str = ""
+
+
+class SavedSearchRequest(BaseModel):
+    user_id: str
+    query: str
+    radius_km: float = 5.0
+
+user_fields = FieldProjector(User)
+post_fields = FieldProjector(Post, common=["id,title,author,created_at,image,category"])
+property_fields = FieldProjector(Property, common=["id,title,price,location,image"])
+
+FIELDS_DESCRIPTION = "Comma-separated list of fields to return, e.g. id,title,price"
+INCLUDE_DESCRIPTION = "Comma-separated related records to embed; supports 'author'"
+POST_INCLUDES = frozenset({"author"})
+
+
+def project_response(projector: FieldProjector, records, fields: str):
+    """Apply a sparse fieldset and serialize directly, skipping response_model validation"""
+    try:
+        if isinstance(records, list):
+            content = projector.project(records, fields)
+        else:
+            content = projector.project_one(records, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return JSONResponse(content)
+
 
 users_db = []
 posts_db = []
-property_db = []
+
+# id -> record lookups kept in step with the lists above
+users_by_id: Dict[str, Dict[str, Any]] = {}
+posts_by_id: Dict[str, Dict[str, Any]] = {}
+
+# Spatial index of property coordinates for "near" queries
+property_locations = GridIndex(cell_km=2.0)
+
+# Bumped on every property write; invalidates cached filter results
+catalog_version = CatalogVersion()
+search_results = FilterResultCache(catalog_version)
+
+# Relevance index over property title/description/location
+property_text_index = BM25Index()
+
+# Facet bitmaps and incrementally maintained global facet counts
+property_facets = FacetIndex()
+
+# Typeahead over catalog terms, gazetteers and popular past queries
+property_suggestions = SuggestionTrie(top_k=10)
+suggested_queries = set()
+MAX_SUGGESTED_QUERIES = 10000
+
+
+# Sparse hashed TF-IDF + numeric features behind "similar listings"
+property_similarity = SimilarityIndex(dims=1024)
+similarity_refresher: Optional[asyncio.Task] = None
+SIMILARITY_REFRESH_SECONDS = float(os.environ.get("SIMILARITY_REFRESH_SECONDS", "30"))
+
+
+async def refresh_similarity_norms():
+    """Recompute listing norms under the current idf on a worker thread"""
+    loop = asyncio.get_running_loop()
+    property_similarity.apply_norms(await loop.run_in_executor(None, property_similarity.compute_norms))
+
+
+async def refresh_similarity_periodically():
+    while True:
+        await asyncio.sleep(SIMILARITY_REFRESH_SECONDS)
+        if property_similarity.writes_since_refresh:
+            try:
+                await refresh_similarity_norms()
+            except Exception:
+                logger.exception("Similarity norm refresh failed")
+
+
+# Typo tolerance for location words from the gazetteers and the catalog
+location_speller = SymSpellIndex()
+
+
+def index_property_suggestions(p: Dict[str, Any]):
+    property_suggestions.add(p["title"], kind="title")
+    property_suggestions.add(p["location"], kind="location")
+    property_suggestions.add(p["property_type"], kind="property_type")
+
+
+def unindex_property_suggestions(p: Dict[str, Any]):
+    property_suggestions.discard(p["title"])
+    property_suggestions.discard(p["location"])
+    property_suggestions.discard(p["property_type"])
+
+
+# Per-user property/post totals behind the profile summary
+user_aggregates = UserAggregates()
+
+# Maintained recent/likes/comments/trending orders over posts
+post_orders = PostOrders()
+
+# Parsed created_at per collection for date-range filters (properties keep theirs in the store)
+user_created = TimeIndex()
+post_created = TimeIndex()
+CREATED_AFTER_DESCRIPTION = "Only records created at or after this ISO date/time"
+CREATED_BEFORE_DESCRIPTION = "Only records created before this ISO date/time"
+
+
+# The live property catalog; every write fans out to the indexes above
+property_store = PropertyStore(catalog_version)
+
+
+def index_property(p: Dict[str, Any]):
+    if p.get("latitude") is not None and p.get("longitude") is not None:
+        property_locations.add(p["id"], p["latitude"], p["longitude"])
+    property_text_index.add(p["id"], p)
+    property_facets.add(p)
+    property_similarity.add(p["id"], p)
+    user_aggregates.add_property(p)
+    index_property_suggestions(p)
+    location_speller.add_words(p["location"])
+
+
+def unindex_property(p: Dict[str, Any]):
+    property_locations.remove(p["id"])
+    property_text_index.remove(p["id"])
+    property_facets.remove(p["id"])
+    property_similarity.remove(p["id"])
+    user_aggregates.remove_property(p)
+    unindex_property_suggestions(p)
+
+
+property_store.subscribe(index_property, unindex_property)
+
+
+# Saved NLP searches, reverse-indexed so a new listing only checks plausible ones
+saved_searches: Dict[str, Dict[str, Any]] = {}
+saved_searches_by_user: Dict[str, Dict[str, None]] = {}
+saved_search_index = SavedSearchIndex()
+property_alerts: Dict[str, deque] = {}
+MAX_ALERTS_PER_USER = 100
+
+
+def notify_saved_searches(p: Dict[str, Any]):
+    """Queue an alert for every saved search the new listing matches"""
+    for search_id in saved_search_index.match(p):
+        search = saved_searches[search_id]
+        alerts = property_alerts.setdefault(search["user_id"], deque(maxlen=MAX_ALERTS_PER_USER))
+        alerts.appendleft({
+            "search_id": search_id,
+            "query": search["query"],
+            "property_id": p["id"],
+            "title": p["title"],
+            "price": p["price"],
+            "location": p["location"],
+            "created_at": datetime.now().isoformat(),
+        })
+
+
+def parse_includes(include: Optional[str], allowed: frozenset) -> set:
+    names = {name.strip() for name in include.split(",") if name.strip()} if include else set()
+    unknown = names - allowed
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+    return names
+
+
+def load_users(user_ids) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Resolve a batch of user ids in one pass, each distinct id looked up once"""
+    return {user_id: users_by_id.get(user_id) for user_id in set(user_ids)}
+
+
+def posts_payload(posts: List[Dict[str, Any]], fields: Optional[str], includes: set) -> List[Dict[str, Any]]:
+    """Project posts and embed included relations, ready to serialize directly"""
+    try:
+        content = post_fields.project(posts, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if "author" in includes:
+        authors = load_users(p["author"] for p in posts)
+        content = [{**item, "author_user": authors[p["author"]]} for item, p in zip(content, posts)]
+    return content
+
+
+def record_popular_query(query: str):
+    """Count a query that returned results towards its typeahead popularity"""
+    key = normalize_suggestion(query)
+    if key not in suggested_queries:
+        if len(suggested_queries) >= MAX_SUGGESTED_QUERIES:
+            return
+        suggested_queries.add(key)
+    property_suggestions.add(query, kind="query")
+
+
+def new_user_record(user: CreateUserRequest, created_at: str) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        **user.model_dump(),
+        "created_at": created_at,
+    }
+
+
+def new_post_record(post: CreatePostRequest, created_at: str) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        **post.model_dump(),
+        "created_at": created_at,
+        "likes": 0,
+        "comments": 0,
+    }
+
+
+def add_users(users: List[Dict[str, Any]]):
+    users_db.extend(users)
+    users_by_id.update((u["id"], u) for u in users)
+    user_created.add_many(users)
+
+
+def add_posts(posts: List[Dict[str, Any]]):
+    posts_db.extend(posts)
+    posts_by_id.update((p["id"], p) for p in posts)
+    post_created.add_many(posts)
+    for p in posts:
+        user_aggregates.add_post(p)
+        post_orders.add(p)
+
+
+# Durable log of API writes (enabled by WAL_PATH). Entries are upserts of
+# absolute state, keyed so compaction can rewrite the log from memory.
+wal: Optional[WriteAheadLog] = None
+wal_compactor: Optional[asyncio.Task] = None
+logged_keys: Dict[tuple, None] = {}
+WAL_COMPACT_BYTES = int(os.environ.get("WAL_COMPACT_BYTES", str(16 * 1024 * 1024)))
+WAL_COMPACT_CHECK_SECONDS = float(os.environ.get("WAL_COMPACT_CHECK_SECONDS", "30"))
+
+
+def set_post_engagement(post: Dict[str, Any], likes: int, comments: int):
+    user_aggregates.add_engagement(post["author"], likes=likes - post["likes"], comments=comments - post["comments"])
+    post["likes"], post["comments"] = likes, comments
+    post_orders.update(post)
+
+
+def wal_entry(kind: str, record_id: str) -> Optional[tuple]:
+    """Current state of a logged record as a log entry (None if nothing to write)"""
+    if kind == "user":
+        user = users_by_id.get(record_id)
+        return ("user.put", user) if user else None
+    if kind == "post":
+        post = posts_by_id.get(record_id)
+        return ("post.put", post) if post else None
+    if kind == "engagement":
+        post = posts_by_id.get(record_id)
+        if not post:
+            return None
+        return ("post.engagement", {"id": record_id, "likes": post["likes"], "comments": post["comments"]})
+    prop = property_store.get(record_id)
+    return ("property.put", prop.to_dict()) if prop else ("property.delete", {"id": record_id})
+
+
+def apply_logged(op: str, data: Dict[str, Any]):
+    """Re-apply one replayed log entry to the in-memory stores"""
+    record_id = data["id"]
+    if op == "user.put":
+        if record_id in users_by_id:
+            users_by_id[record_id].update(data)
+        else:
+            add_users([data])
+        logged_keys[("user", record_id)] = None
+    elif op == "post.put":
+        post = posts_by_id.get(record_id)
+        if post is None:
+            add_posts([data])
+        else:
+            set_post_engagement(post, data["likes"], data["comments"])
+        logged_keys[("post", record_id)] = None
+    elif op == "post.engagement":
+        post = posts_by_id.get(record_id)
+        if post is not None:
+            set_post_engagement(post, data["likes"], data["comments"])
+            logged_keys[("engagement", record_id)] = None
+    elif op == "property.put":
+        if record_id in property_store:
+            property_store.update(record_id, data)
+        else:
+            property_store.add(data)
+        logged_keys[("property", record_id)] = None
+    elif op == "property.delete":
+        if record_id in property_store:
+            property_store.remove(record_id)
+        logged_keys[("property", record_id)] = None
+    else:
+        raise ValueError(f"Unknown write-ahead log op: {op}")
+
+
+async def log_writes(kind: str, record_ids: List[str]):
+    """
+    Make already-applied writes durable before the request is acknowledged
+    """
+    if wal is None:
+        return
+    entries = []
+    for record_id in record_ids:
+        logged_keys[(kind, record_id)] = None
+        entry = wal_entry(kind, record_id)
+        if entry:
+            entries.append(entry)
+    await wal.append_many(entries)
+
+
+def wal_snapshot():
+    for kind, record_id in list(logged_keys):
+        entry = wal_entry(kind, record_id)
+        if entry:
+            yield entry
+
+
+async def compact_wal_periodically():
+    while True:
+        await asyncio.sleep(WAL_COMPACT_CHECK_SECONDS)
+        if wal.needs_compaction(WAL_COMPACT_BYTES):
+            try:
+                await wal.compact(wal_snapshot)
+            except Exception:
+                logger.exception("Write-ahead log compaction failed")
+
+
+async def open_wal():
+    """Replay the log over the seeded catalog, then start logging new writes"""
+    global wal, wal_compactor
+    path = os.environ.get("WAL_PATH")
+    if not path:
+        return
+    replayed = 0
+    for op, data in replay_log(path):
+        apply_logged(op, data)
+        replayed += 1
+    wal = WriteAheadLog(path)
+    await wal.start()
+    wal_compactor = asyncio.create_task(compact_wal_periodically())
+    logger.info("Replayed write-ahead log", extra={"path": path, "records": replayed})
+
+
+async def close_wal():
+    global wal
+    if wal is None:
+        return
+    wal_compactor.cancel()
+    await wal.close()
+    wal = None
+
+
+# Change feed for /events; create endpoints publish once their writes are durable
+broadcaster = Broadcaster(
+    queue_size=int(os.environ.get("SSE_QUEUE_SIZE", "256")),
+    heartbeat_seconds=float(os.environ.get("SSE_HEARTBEAT_SECONDS", "15")),
+)
+REGISTRY.gauge("sse_subscribers", "Open SSE connections", function=lambda: len(broadcaster))
+
+
+def publish_created(topic: str, records: List[Dict[str, Any]]):
+    for record in records:
+        broadcaster.publish(topic, CREATED_EVENTS[topic], record)
+
+
+def check_batch_size(items: List[Dict[str, Any]]):
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(items)} items (max {BULK_MAX_ITEMS})"
+        )
+
+def seed_synthetic_catalog():
+    """
+    Stream a generated catalog into the stores when SYNTHETIC_* env vars ask for one
+    """
+    users = int(os.environ.get("SYNTHETIC_USERS", "0"))
+    posts = int(os.environ.get("SYNTHETIC_POSTS", "0"))
+    properties = int(os.environ.get("SYNTHETIC_PROPERTIES", "0"))
+    if not (users or posts or properties):
+        return
+    catalog = SyntheticCatalog(seed=int(os.environ.get("SYNTHETIC_SEED", "42")))
+    # Without synthetic users, generated records belong to the sample users
+    owners = users or [u["id"] for u in sample_users]
+    for batch in batched(catalog.users(users), 10000):
+        add_users(batch)
+    for batch in batched(catalog.posts(posts, owners), 10000):
+        add_posts(batch)
+    property_store.add_many(catalog.properties(properties, owners))
+    logger.info("Loaded synthetic catalog", extra={
+        "users": users, "posts": posts, "properties": properties
+    })
 
 @app.on_event("startup")
 async def startup_event():
-    users_db.extend(sample_users)
-    posts_db.extend(sample_posts)
-    property_db.extend(sample_properties)
+    global similarity_refresher
+    configure_logging()
+    add_users(sample_users)
+    add_posts(sample_posts)
+    property_store.add_many(sample_properties)
+    seed_synthetic_catalog()
+    await open_wal()
+    # Norms computed while seeding used a partial idf
+    await refresh_similarity_norms()
+    similarity_refresher = asyncio.create_task(refresh_similarity_periodically())
+    broadcaster.start()
+    for location in KENYAN_LOCATIONS:
+        property_suggestions.add(location.title(), kind="location")
+        location_speller.add_words(location)
+    for university in KENYAN_UNIVERSITIES:
+        property_suggestions.add(university.title(), kind="landmark")
+        location_speller.add_words(university)
+    if nlp.enabled() and os.environ.get("NLP_PRELOAD", "0") == "1":
+        # Warm the parser in the background so the first search doesn't pay for it
+        asyncio.create_task(nlp.load())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    broadcaster.stop()
+    if similarity_refresher is not None:
+        similarity_refresher.cancel()
+    await close_wal()
+    shutdown_logging()
 
 @app.get("/")
 async def root():
@@ -88,51 +571,214 @@ async def root():
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/events")
+async def stream_events(
+    topics: Optional[str] = Query(None, description="Comma-separated: users, posts, properties (default: all)"),
+    property_type: Optional[str] = Query(None, description="Only property events of this type"),
+    location: Optional[str] = Query(None, description="Only property events whose location contains this"),
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Server-sent events for newly created users, posts and properties
+    """
+    selected = [t.strip().lower() for t in topics.split(",") if t.strip()] if topics else list(CREATED_EVENTS)
+    unknown = [t for t in selected if t not in CREATED_EVENTS]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown topics: {', '.join(unknown)}. Available: {', '.join(CREATED_EVENTS)}"
+        )
+    subscription = broadcaster.subscribe(selected, property_type, location, last_event_id)
+    return StreamingResponse(
+        broadcaster.stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/users", response_model=List[User])
-async def get_users(skip: int = 0, limit: int = 10):
-    return users_db[skip:skip + limit]
+async def get_users(
+    skip: int = 0,
+    limit: int = 10,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    created_after: Optional[Union[datetime, date]] = Query(None, description=CREATED_AFTER_DESCRIPTION),
+    created_before: Optional[Union[datetime, date]] = Query(None, description=CREATED_BEFORE_DESCRIPTION)
+):
+    if created_after or created_before:
+        # Date-filtered pages come back oldest first
+        ids = user_created.between(bound_to_epoch(created_after), bound_to_epoch(created_before))
+        users = [users_by_id[user_id] for user_id in islice(ids, skip, skip + limit)]
+    else:
+        users = users_db[skip:skip + limit]
+    if fields:
+        return project_response(user_fields, users, fields)
+    return users
 
 @app.get("/users/{user_id}", response_model=User)
-async def get_user(user_id: str):
-    user = next((u for u in users_db if u["id"] == user_id), None)
+async def get_user(user_id: str, fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
+    user = users_by_id.get(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if fields:
+        return project_response(user_fields, user, fields)
     return user
 
+@app.get("/users/{user_id}/summary")
+async def get_user_summary(user_id: str):
+    """
+    Property and post totals for a user's profile page
+    """
+    if user_id not in users_by_id:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"user_id": user_id, **user_aggregates.summary(user_id)}
+
 @app.post("/users", response_model=User)
 async def create_user(user: CreateUserRequest):
-    new_user = {
-        "id": str(uuid.uuid4()),
-        "name": user.name,
-        "email": user.email,
-        "created_at": datetime.now().isoformat()
-    }
-    users_db.append(new_user)
+    new_user = new_user_record(user, datetime.now().isoformat())
+    add_users([new_user])
+    await log_writes("user", [new_user["id"]])
+    publish_created("users", [new_user])
     return new_user
 
+@app.post("/users/bulk")
+async def create_users_bulk(
+    items: List[Dict[str, Any]] = Body(...),
+    atomic: bool = Query(False, description="Reject the whole batch if any item is invalid")
+):
+    """
+    Create many users in one request, reporting a result per item
+    """
+    check_batch_size(items)
+    valid, errors = validate_batch(CreateUserRequest, items)
+    if atomic and errors:
+        return JSONResponse(batch_results([], errors, skipped=valid), status_code=422)
+
+    created_at = datetime.now().isoformat()
+    created = [(index, new_user_record(user, created_at)) for index, user in valid]
+    add_users([record for _, record in created])
+    await log_writes("user", [record["id"] for _, record in created])
+    publish_created("users", [record for _, record in created])
+    return batch_results(created, errors)
+
 @app.get("/posts", response_model=List[Post])
-async def get_posts(skip: int = 0, limit: int = 10):
-    return posts_db[skip:skip + limit]
+async def get_posts(
+    skip: int = 0,
+    limit: int = 10,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    sort: Optional[str] = Query(None, description="recent, likes, comments or trending; default is insertion order"),
+    created_after: Optional[Union[datetime, date]] = Query(None, description=CREATED_AFTER_DESCRIPTION),
+    created_before: Optional[Union[datetime, date]] = Query(None, description=CREATED_BEFORE_DESCRIPTION)
+):
+    after, before = bound_to_epoch(created_after), bound_to_epoch(created_before)
+    dated = after is not None or before is not None
+    if sort:
+        try:
+            if dated:
+                ids = (
+                    post_id for post_id in post_orders.iter(sort)
+                    if in_range(post_created.timestamp(post_id), after, before)
+                )
+                page_ids = list(islice(ids, skip, skip + limit))
+            else:
+                page_ids = post_orders.page(sort, skip, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        posts = [posts_by_id[post_id] for post_id in page_ids]
+    elif dated:
+        # Date-filtered pages come back oldest first
+        ids = post_created.between(after, before)
+        posts = [posts_by_id[post_id] for post_id in islice(ids, skip, skip + limit)]
+    else:
+        posts = posts_db[skip:skip + limit]
+    includes = parse_includes(include, POST_INCLUDES)
+    if includes:
+        return JSONResponse(posts_payload(posts, fields, includes))
+    if fields:
+        return project_response(post_fields, posts, fields)
+    return posts
+
+@app.get("/posts/trending", response_model=List[Post])
+async def get_trending_posts(
+    limit: int = Query(10, ge=1, le=100),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION)
+):
+    """
+    Top posts by trending score (engagement weighted by recency)
+    """
+    posts = [posts_by_id[post_id] for post_id in post_orders.page("trending", 0, limit)]
+    includes = parse_includes(include, POST_INCLUDES)
+    if includes:
+        return JSONResponse(posts_payload(posts, None, includes))
+    return posts
 
 @app.get("/posts/{post_id}", response_model=Post)
-async def get_post(post_id: str):
-    post = next((p for p in posts_db if p["id"] == post_id), None)
+async def get_post(
+    post_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION)
+):
+    post = posts_by_id.get(post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    includes = parse_includes(include, POST_INCLUDES)
+    if includes:
+        return JSONResponse(posts_payload([post], fields, includes)[0])
+    if fields:
+        return project_response(post_fields, post, fields)
     return post
 
 @app.post("/posts", response_model=Post)
 async def create_post(post: CreatePostRequest):
-    new_post = {
-        "id": str(uuid.uuid4()),
-        "title": post.title,
-        "content": post.content,
-        "author": post.author,
-        "created_at": datetime.now().isoformat()
-    }
-    posts_db.append(new_post)
+    new_post = new_post_record(post, datetime.now().isoformat())
+    add_posts([new_post])
+    await log_writes("post", [new_post["id"]])
+    publish_created("posts", [new_post])
     return new_post
 
+async def add_engagement(post_id: str, likes: int = 0, comments: int = 0) -> Dict[str, Any]:
+    post = posts_by_id.get(post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    set_post_engagement(post, post["likes"] + likes, post["comments"] + comments)
+    await log_writes("engagement", [post_id])
+    return post
+
+@app.post("/posts/{post_id}/like", response_model=Post)
+async def like_post(post_id: str):
+    return await add_engagement(post_id, likes=1)
+
+@app.post("/posts/{post_id}/comment", response_model=Post)
+async def comment_on_post(post_id: str):
+    """
+    Count a comment on a post (comment bodies are not stored yet)
+    """
+    return await add_engagement(post_id, comments=1)
+
+@app.post("/posts/bulk")
+async def create_posts_bulk(
+    items: List[Dict[str, Any]] = Body(...),
+    atomic: bool = Query(False, description="Reject the whole batch if any item is invalid")
+):
+    """
+    Create many posts in one request, reporting a result per item
+    """
+    check_batch_size(items)
+    valid, errors = validate_batch(CreatePostRequest, items)
+    if atomic and errors:
+        return JSONResponse(batch_results([], errors, skipped=valid), status_code=422)
+
+    created_at = datetime.now().isoformat()
+    created = [(index, new_post_record(post, created_at)) for index, post in valid]
+    add_posts([record for _, record in created])
+    await log_writes("post", [record["id"] for _, record in created])
+    publish_created("posts", [record for _, record in created])
+    return batch_results(created, errors)
+
 @app.get("/search")
 async def search_posts(q: Optional[str] = None):
     if not q:
@@ -149,40 +795,80 @@ async def get_properties(
     property_type: Optional[str] = None,
     min_price: Optional[int] = None,
     max_price: Optional[int] = None,
-    bedrooms: Optional[int] = None
+    bedrooms: Optional[int] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    created_after: Optional[Union[datetime, date]] = Query(None, description=CREATED_AFTER_DESCRIPTION),
+    created_before: Optional[Union[datetime, date]] = Query(None, description=CREATED_BEFORE_DESCRIPTION)
 ):
     """
     Get properties with filtering and pagination
     """
-    filtered_properties = property_db
-    
-    # Apply filters
+    after, before = bound_to_epoch(created_after), bound_to_epoch(created_before)
+    dated = after is not None or before is not None
+
+    # Start from the narrowest index available, then filter the rest
     if property_type:
-        filtered_properties = [p for p in filtered_properties if p["property_type"].lower() == property_type.lower()]
+        filtered_properties = property_store.by_type(property_type)
+    elif min_price is not None or max_price is not None:
+        filtered_properties = property_store.in_price_range(min_price, max_price)
+    elif dated:
+        filtered_properties = property_store.created_between(after, before)
+    else:
+        filtered_properties = property_store.values()
+
+    if dated:
+        filtered_properties = (p for p in filtered_properties if in_range(p.created_ts, after, before))
     
+    # Apply filters
     if min_price is not None:
-        filtered_properties = [p for p in filtered_properties if p["price"] >= min_price]
+        filtered_properties = (p for p in filtered_properties if p["price"] >= min_price)
     
     if max_price is not None:
-        filtered_properties = [p for p in filtered_properties if p["price"] <= max_price]
+        filtered_properties = (p for p in filtered_properties if p["price"] <= max_price)
     
     if bedrooms is not None:
-        filtered_properties = [p for p in filtered_properties if p["bedrooms"] >= bedrooms]
+        filtered_properties = (p for p in filtered_properties if p["bedrooms"] >= bedrooms)
     
     #  pagination
-    return filtered_properties[skip:skip + limit]
+    page = list(islice(filtered_properties, skip, skip + limit))
+    if fields:
+        return project_response(property_fields, page, fields)
+    return to_dicts(page)
+
+
 
+@app.get("/properties/facets")
+async def get_property_facets(
+    property_type: Optional[str] = None,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    bedrooms: Optional[int] = None
+):
+    """
+    Counts per property type, bedroom count and price band under the same filters as /properties
+    """
+    return property_facets.counts(
+        property_type=property_type,
+        min_price=min_price,
+        max_price=max_price,
+        bedrooms=bedrooms
+    )
 
 
 @app.get("/properties/type/{property_type}", response_model=List[Property])
-async def get_properties_by_type(property_type: str):
+async def get_properties_by_type(
+    property_type: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Get all properties of a specific type
     """
-    properties = [p for p in property_db if p["property_type"].lower() == property_type.lower()]
+    properties = property_store.by_type(property_type)
     if not properties:
         raise HTTPException(status_code=404, detail=f"No properties found for type: {property_type}")
-    return properties
+    if fields:
+        return project_response(property_fields, properties, fields)
+    return to_dicts(properties)
 
 
 @app.get("/properties/list/search")
@@ -190,30 +876,113 @@ async def search_properties(
     type: Optional[str] = Query(None),
     location: Optional[str] = Query(None),
     bedrooms: Optional[int] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
-    print("Handling Search", type, location, bedrooms)
+    logger.debug("Handling search", extra={"type": type, "location": location, "bedrooms": bedrooms})
 
-    results = property_db 
+    # Filter in one pass over the narrowest source instead of copying the catalog
+    source = property_store.by_type(type) if type else property_store.values()
+    location = location.lower() if location else None
+    results = [
+        p for p in source
+        if (not location or location in p["location"].lower()) and (not bedrooms or p["bedrooms"] == bedrooms)
+    ]
 
-    if type:
-        results = [p for p in results if p["property_type"].lower() == type.lower()]
-    if location:
-        results = [p for p in results if location.lower() in p["location"].lower()]
-    if bedrooms:
-        results = [p for p in results if p["bedrooms"] == bedrooms]
-
-    return results
+    if fields:
+        return project_response(property_fields, results, fields)
+    return to_dicts(results)
 
 
 from fastapi import Query, HTTPException
 from typing import Optional
 
+def rank_properties(query: str, matched: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """
+    Best ``limit`` of the filtered properties by BM25 relevance.
+
+    Only properties that passed the structured filters are scored. When
+    fewer than ``limit`` of them match any query term, the rest are
+    filled in catalog order.
+    """
+    by_id = {p["id"]: p for p in matched}
+    ranked = [by_id[doc_id] for doc_id, _ in property_text_index.top_k(query, limit, by_id)]
+    if len(ranked) < limit:
+        seen = {p["id"] for p in ranked}
+        for p in matched:
+            if len(ranked) >= limit:
+                break
+            if p["id"] not in seen:
+                ranked.append(p)
+    return ranked
+
+
+async def parse_search_entities(query: str) -> Dict[str, Any]:
+    """Parse an NLP query into filter entities, with locations spell-corrected"""
+    try:
+        parsed = await nlp.parse(query.strip().lower())
+    except nlp.NLPDisabled as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if not parsed["success"]:
+        raise HTTPException(
+            status_code=422, 
+            detail=f"Could not understand query: {parsed.get('error', 'Unknown error')}"
+        )
+
+    entities = parsed.get("entities", {})
+    if entities.get("location"):
+        entities["location"], _ = location_speller.correct_text(entities["location"])
+    return entities
+
+
+# Concurrent identical NLP searches share one parse-and-filter pass
+nlp_search_flights = SingleFlight("nlp_search")
+
+
+async def match_properties(query: str, radius_km: float):
+    """
+    Parse a query and run its filters.
+
+    Returns (entities, near, matched) where ``near`` is the resolved
+    landmark for proximity queries. Results may be shared between
+    concurrent requests, so callers must not modify them.
+    """
+    entities = await parse_search_entities(query)
+
+    near = None
+    if entities.get("location") and "near" in (entities.get("proximity"), entities.get("location_relation")):
+        near = resolve_landmark(entities["location"])
+
+    if near:
+        landmark, (lat, lng) = near
+        cache_key = filter_key(entities, landmark=landmark, radius_km=radius_km)
+    else:
+        cache_key = filter_key(entities)
+
+    matched_ids = search_results.get(cache_key)
+    if matched_ids is not None:
+        matched = [property_store.get(key) for key in matched_ids]
+    elif near:
+        # Radius query around the landmark, nearest first, other filters still apply
+        hits = property_locations.within(lat, lng, radius_km)
+        other_filters = {k: v for k, v in entities.items() if k != "location"}
+        matched = apply_filters(
+            (property_store.get(key) for key, _ in hits), compile_filters(other_filters)
+        )
+    else:
+        matched = apply_filters(property_store.values(), compile_filters(entities))
+    if matched_ids is None:
+        search_results.put(cache_key, [p["id"] for p in matched])
+    return entities, near, matched
+
 @app.get("/search-properties/v2/nlp-search")
-async def nlp_search(query: Optional[str] = Query(None, description="NLP search query")):
+async def nlp_search(
+    query: Optional[str] = Query(None, description="NLP search query"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of ranked results"),
+    radius_km: float = Query(5.0, gt=0, le=100, description="Search radius for 'near' queries")
+):
     """SEO-friendly NLP search (GET)"""
     
-    # Debug logging
-    print(f"Received query: {query}")
+    logger.debug("Received query", extra={"query": query})
     
     # Handle missing or empty query
     if not query or not query.strip():
@@ -223,80 +992,262 @@ async def nlp_search(query: Optional[str] = Query(None, description="NLP search
         )
 
     try:
-        parsed = await get_query_parser(query.strip().lower())
-        
-        if not parsed["success"]:
-            raise HTTPException(
-                status_code=422, 
-                detail=f"Could not understand query: {parsed.get('error', 'Unknown error')}"
-            )
+        normalized = normalize_suggestion(query)
+        entities, near, matched = await nlp_search_flights.do(
+            (normalized, radius_km), lambda: match_properties(normalized, radius_km)
+        )
 
-        entities = parsed.get("entities", {})
-        matched = sample_properties.copy()
-
-        # Apply filters
-        for key, value in entities.items():
-            if not value:
-                continue
-
-            if isinstance(value, list):  # amenities
-                matched = [
-                    p for p in matched
-                    if all(
-                        any(v.lower() in str(p.get(field, "")).lower() 
-                            for field in ["description", "title", "amenities"])
-                        for v in value
-                    )
-                ]
-            else:  # location, property_type, bedrooms, etc.
-                matched = [
-                    p for p in matched
-                    if str(value).lower() in str(p.get(key, "")).lower()
-                ]
-
-        return {
+        if near:
+            landmark, (lat, lng) = near
+            ranked = [
+                {**p, "distance_km": round(haversine_km(lat, lng, p["latitude"], p["longitude"]), 2)}
+                for p in matched[:limit]
+            ]
+        else:
+            ranked = to_dicts(rank_properties(query, matched, limit))
+        if matched:
+            record_popular_query(query)
+
+        response = {
             "success": True,
             "query": query,
             "filters": entities,
             "results_count": len(matched),
-            "properties": matched,
+            "properties": ranked,
             "seo": {
                 "title": f"Properties matching '{query}'",
                 "description": f"Find properties related to: {query}",
-                "image": matched[0]["image"] if matched else ""
+                "image": ranked[0]["image"] if ranked else ""
             }
         }
+        if near:
+            response["near"] = {"landmark": landmark, "latitude": lat, "longitude": lng, "radius_km": radius_km}
+        return response
         
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+        logger.exception("Unexpected error in nlp search", extra={"query": query})
         raise HTTPException(
             status_code=500, 
             detail="Internal server error while processing search"
         )
 
 
+@app.get("/search-properties/v2/suggest")
+async def suggest(
+    q: str = Query(..., min_length=1, description="Prefix typed so far"),
+    limit: int = Query(8, ge=1, le=10)
+):
+    """Typeahead suggestions for the search bar, ranked by popularity"""
+    return {"query": q, "suggestions": property_suggestions.suggest(q, limit)}
+
+
+@app.get("/properties/near")
+async def get_properties_near(
+    landmark: Optional[str] = Query(None, description="Gazetteer landmark, e.g. 'jkuat'"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0, le=100),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Properties within a radius of a landmark or a coordinate, nearest first
+    """
+    if landmark:
+        resolved = resolve_landmark(location_speller.correct_text(landmark)[0])
+        if not resolved:
+            raise HTTPException(status_code=404, detail=f"Unknown landmark: {landmark}")
+        landmark, (lat, lng) = resolved
+    elif lat is None or lng is None:
+        raise HTTPException(status_code=422, detail="Provide either landmark or both lat and lng")
+
+    hits = property_locations.within(lat, lng, radius_km, limit=limit)
+    return {
+        "landmark": landmark,
+        "latitude": lat,
+        "longitude": lng,
+        "radius_km": radius_km,
+        "properties": [
+            {**property_store.get(key), "distance_km": round(distance, 2)} for key, distance in hits
+        ]
+    }
+
+
 @app.get("/properties/owner/{owner_id}", response_model=List[Property])
-async def get_properties_by_owner(owner_id: str):
+async def get_properties_by_owner(
+    owner_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Get all properties owned by a specific user
     """
-    properties = [p for p in property_db if p["owner_id"] == owner_id]
+    properties = property_store.by_owner(owner_id)
     if not properties:
         raise HTTPException(status_code=404, detail=f"No properties found for owner: {owner_id}")
-    return properties
+    if fields:
+        return project_response(property_fields, properties, fields)
+    return to_dicts(properties)
+
+@app.get("/properties/{property_id}/similar")
+async def get_similar_properties(
+    property_id: str,
+    limit: int = Query(6, ge=1, le=20)
+):
+    """
+    Listings most similar to a property by text and price/size profile
+    """
+    if property_id not in property_store:
+        raise HTTPException(status_code=404, detail="Property not found")
+    similar = property_similarity.similar(property_id, limit)
+    return {
+        "property_id": property_id,
+        "properties": [
+            {**property_store.get(key), "similarity": round(score, 4)} for key, score in similar
+        ]
+    }
 
 @app.get("/properties/{property_id}", response_model=Property)
-async def get_property(property_id: str):
+async def get_property(
+    property_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Get a specific property by ID
     """
-    property = next((p for p in property_db if p["id"] == property_id), None)
+    property = property_store.get(property_id)
     if not property:
         raise HTTPException(status_code=404, detail="Property not found")
-    return property
+    if fields:
+        return project_response(property_fields, property, fields)
+    return property.to_dict()
+
+@app.post("/properties", response_model=Property)
+async def create_property(property: CreatePropertyRequest):
+    """
+    Create a property; all search indexes are updated in place
+    """
+    if property.owner_id not in users_by_id:
+        raise HTTPException(status_code=422, detail=f"Unknown owner: {property.owner_id}")
+    new_property = {
+        "id": str(uuid.uuid4()),
+        **property.model_dump(),
+        "created_at": datetime.now().isoformat(),
+    }
+    notify_saved_searches(property_store.add(new_property))
+    await log_writes("property", [new_property["id"]])
+    publish_created("properties", [new_property])
+    return new_property
+
+@app.patch("/properties/{property_id}", response_model=Property)
+async def update_property(property_id: str, changes: UpdatePropertyRequest):
+    """
+    Update some fields of a property
+    """
+    if property_id not in property_store:
+        raise HTTPException(status_code=404, detail="Property not found")
+    updates = changes.model_dump(exclude_unset=True)
+    nulls = [field for field, value in updates.items() if value is None and field not in NULLABLE_FIELDS]
+    if nulls:
+        raise HTTPException(status_code=422, detail=f"Fields cannot be null: {', '.join(nulls)}")
+    try:
+        # The merged row must still be a valid property
+        CreatePropertyRequest.model_validate({**property_store.get(property_id).to_dict(), **updates})
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False, include_input=False)
+        )
+    if updates.get("owner_id") is not None and updates["owner_id"] not in users_by_id:
+        raise HTTPException(status_code=422, detail=f"Unknown owner: {updates['owner_id']}")
+    updated = property_store.update(property_id, updates)
+    await log_writes("property", [property_id])
+    return updated.to_dict()
+
+@app.delete("/properties/{property_id}", response_model=Property)
+async def delete_property(property_id: str):
+    """
+    Delete a property and drop it from every index
+    """
+    if property_id not in property_store:
+        raise HTTPException(status_code=404, detail="Property not found")
+    removed = property_store.remove(property_id)
+    await log_writes("property", [property_id])
+    return removed.to_dict()
+
+@app.post("/saved-searches")
+async def create_saved_search(request: SavedSearchRequest):
+    """
+    Save an NLP query; new listings matching it raise alerts for the user
+    """
+    if request.user_id not in users_by_id:
+        raise HTTPException(status_code=422, detail=f"Unknown user: {request.user_id}")
+    if not request.query.strip():
+        raise HTTPException(status_code=422, detail="Query cannot be empty")
+
+    entities = await parse_search_entities(request.query)
+    if not compile_filters(entities):
+        raise HTTPException(status_code=422, detail="Query has no filters to match listings against")
+    search = {
+        "id": str(uuid.uuid4()),
+        "user_id": request.user_id,
+        "query": request.query,
+        "filters": entities,
+        "created_at": datetime.now().isoformat(),
+    }
+
+    near = None
+    if entities.get("location") and "near" in (entities.get("proximity"), entities.get("location_relation")):
+        near = resolve_landmark(entities["location"])
+    if near:
+        # Landmark searches match on distance rather than the location text
+        landmark, (lat, lng) = near
+        other_filters = {k: v for k, v in entities.items() if k != "location"}
+        radius_km = request.radius_km
+
+        def within_radius(p):
+            return (
+                p.get("latitude") is not None and p.get("longitude") is not None
+                and haversine_km(lat, lng, p["latitude"], p["longitude"]) <= radius_km
+            )
+
+        saved_search_index.add(search["id"], other_filters, extra=[within_radius],
+                               keys=search_keys(other_filters))
+        search["near"] = {"landmark": landmark, "latitude": lat, "longitude": lng, "radius_km": radius_km}
+    else:
+        saved_search_index.add(search["id"], entities)
+
+    saved_searches[search["id"]] = search
+    saved_searches_by_user.setdefault(request.user_id, {})[search["id"]] = None
+    return search
+
+@app.get("/saved-searches/{search_id}")
+async def get_saved_search(search_id: str):
+    search = saved_searches.get(search_id)
+    if not search:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return search
+
+@app.delete("/saved-searches/{search_id}")
+async def delete_saved_search(search_id: str):
+    search = saved_searches.pop(search_id, None)
+    if not search:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    saved_search_index.remove(search_id)
+    saved_searches_by_user.get(search["user_id"], {}).pop(search_id, None)
+    return search
+
+@app.get("/users/{user_id}/saved-searches")
+async def get_user_saved_searches(user_id: str):
+    return [saved_searches[key] for key in saved_searches_by_user.get(user_id, ())]
+
+@app.get("/users/{user_id}/alerts")
+async def get_user_alerts(user_id: str, limit: int = Query(20, ge=1, le=MAX_ALERTS_PER_USER)):
+    """
+    Listings that matched the user's saved searches, newest first
+    """
+    return list(islice(property_alerts.get(user_id, ()), limit))
 
 @app.get("/simulate-error")
 async def simulate_error():
@@ -0,0 +1,48 @@
+from typing import Any, Dict, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+BULK_MAX_ITEMS = 5000
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def validate_batch(
+    model: Type[ModelT], items: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[int, ModelT]], Dict[int, Dict[str, Any]]]:
+    """
+    Validate every item of a bulk request in a single pass.
+
+    Returns the valid items with their positions, and an error result for
+    each invalid position so callers can report per-item outcomes.
+    """
+    valid = []
+    errors = {}
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model.model_validate(item)))
+        except ValidationError as e:
+            errors[index] = {
+                "index": index,
+                "status": "error",
+                "errors": e.errors(include_url=False, include_context=False, include_input=False),
+            }
+    return valid, errors
+
+
+def batch_results(
+    created: List[Tuple[int, Dict[str, Any]]],
+    errors: Dict[int, Dict[str, Any]],
+    skipped: List[Tuple[int, Any]] = (),
+) -> Dict[str, Any]:
+    """Merge created, skipped and invalid items into one per-item report, in request order"""
+    results = dict(errors)
+    for index, _ in skipped:
+        results[index] = {"index": index, "status": "skipped"}
+    for index, record in created:
+        results[index] = {"index": index, "status": "created", "id": record["id"]}
+    return {
+        "created": len(created),
+        "failed": len(errors),
+        "results": [results[index] for index in sorted(results)],
+    }
@@ -0,0 +1,178 @@
+import gzip
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from metrics import REGISTRY
+
+COMPRESSION_CACHE_HITS = REGISTRY.counter(
+    "compression_cache_hits_total", "Responses served from the precompressed cache", ("encoding",)
+)
+COMPRESSION_CACHE_MISSES = REGISTRY.counter(
+    "compression_cache_misses_total", "Cacheable responses that had to be compressed", ("encoding",)
+)
+
+# Preferred order when the client accepts several encodings equally
+SUPPORTED_ENCODINGS = ("gzip", "deflate")
+
+# Streaming content types are never buffered for compression
+UNCOMPRESSIBLE_TYPES = ("text/event-stream", "image/", "video/", "audio/")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported content coding from an Accept-Encoding header.
+
+    Honours q-values (``gzip;q=0`` disables gzip) and the ``*`` wildcard.
+    Returns None when the response should be sent uncompressed.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding] = q
+
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "gzip":
+        # Fixed mtime keeps output identical for identical payloads
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    return zlib.compress(body, level)
+
+
+class CompressedBodyCache:
+    """
+    LRU of compressed bodies keyed by (encoding, digest of the raw body).
+
+    Hashing a payload is far cheaper than compressing it, so identical
+    responses (the same listing page requested over and over) are only
+    compressed once per encoding. Bounded by total compressed bytes.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._size = 0
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: Tuple[str, bytes], body: bytes) -> None:
+        if len(body) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = body
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete responses with gzip or deflate.
+
+    Only single-chunk bodies of at least ``minimum_size`` bytes are
+    compressed; streaming responses pass through untouched. Successful GET
+    responses that aren't marked ``no-store`` go through the precompressed
+    cache.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, level: int = 6,
+                 cache: Optional[CompressedBodyCache] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.cache = cache if cache is not None else CompressedBodyCache()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        cacheable_method = scope["method"] == "GET"
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                # Hold the headers back until we know whether we compress
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or headers.get("content-type", "").startswith(UNCOMPRESSIBLE_TYPES)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            cacheable = (
+                cacheable_method
+                and start["status"] == 200
+                and "no-store" not in headers.get("cache-control", "")
+            )
+            if cacheable:
+                key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+                compressed = self.cache.get(key)
+                if compressed is None:
+                    COMPRESSION_CACHE_MISSES.inc((encoding,))
+                    compressed = compress(body, encoding, self.level)
+                    self.cache.put(key, compressed)
+                else:
+                    COMPRESSION_CACHE_HITS.inc((encoding,))
+            else:
+                compressed = compress(body, encoding, self.level)
+
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
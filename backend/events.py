@@ -0,0 +1,157 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, Optional, Set, Tuple
+
+from metrics import REGISTRY
+
+SSE_PUBLISHED = REGISTRY.counter(
+    "sse_events_published_total", "Change events published to the SSE broadcaster", ("topic",)
+)
+SSE_DROPPED = REGISTRY.counter(
+    "sse_subscribers_dropped_total", "SSE subscribers disconnected because they fell too far behind"
+)
+
+CREATED_EVENTS = {"users": "user.created", "posts": "post.created", "properties": "property.created"}
+HEARTBEAT = b": ping\n\n"
+
+
+def encode_event(event_id: int, event: str, data: Any) -> bytes:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+class Subscription:
+    """One SSE client: its topics, optional property filters and a bounded queue of encoded events"""
+
+    __slots__ = ("topics", "property_type", "location", "queue")
+
+    def __init__(self, topics: Iterable[str], property_type: Optional[str], location: Optional[str],
+                 queue_size: int):
+        self.topics = frozenset(topics)
+        self.property_type = property_type.lower() if property_type else None
+        self.location = location.lower() if location else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def matches(self, topic: str, data: Dict[str, Any]) -> bool:
+        if topic != "properties":
+            return True
+        if self.property_type and data.get("property_type", "").lower() != self.property_type:
+            return False
+        if self.location and self.location not in data.get("location", "").lower():
+            return False
+        return True
+
+
+class Broadcaster:
+    """
+    Fan-out of change events to SSE subscribers.
+
+    Each event is serialized once and the same bytes object is queued for
+    every interested subscriber. Subscribers are indexed by topic (and by
+    property type for typed property feeds), so publishing only visits
+    clients that can want the event. A single heartbeat task pings all
+    connections, so idle clients cost a queue and nothing else. Clients
+    that fall ``queue_size`` events behind are disconnected and can resume
+    from the recent history with Last-Event-ID.
+    """
+
+    def __init__(self, queue_size: int = 256, history: int = 1024, heartbeat_seconds: float = 15.0):
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self._subscribers: Set[Subscription] = set()
+        self._by_topic: Dict[str, Set[Subscription]] = {}
+        self._by_type: Dict[Tuple[str, str], Set[Subscription]] = {}
+        self._history: Deque[Tuple[int, str, Dict[str, Any], bytes]] = deque(maxlen=history)
+        self._next_id = 1
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def _buckets(self, subscription: Subscription):
+        for topic in subscription.topics:
+            if topic == "properties" and subscription.property_type:
+                yield self._by_type.setdefault((topic, subscription.property_type), set())
+            else:
+                yield self._by_topic.setdefault(topic, set())
+
+    def subscribe(self, topics: Iterable[str], property_type: Optional[str] = None,
+                  location: Optional[str] = None, last_event_id: Optional[int] = None) -> Subscription:
+        subscription = Subscription(topics, property_type, location, self.queue_size)
+        if last_event_id is not None:
+            # Replay what the client missed while reconnecting
+            for event_id, topic, data, payload in self._history:
+                if event_id > last_event_id and topic in subscription.topics and subscription.matches(topic, data):
+                    if subscription.queue.full():
+                        break
+                    subscription.queue.put_nowait(payload)
+        self._subscribers.add(subscription)
+        for bucket in self._buckets(subscription):
+            bucket.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription not in self._subscribers:
+            return
+        self._subscribers.discard(subscription)
+        for bucket in self._buckets(subscription):
+            bucket.discard(subscription)
+
+    def _deliver(self, subscription: Subscription, payload: Optional[bytes]) -> None:
+        try:
+            subscription.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Too far behind: end the stream; the client resumes via Last-Event-ID
+            SSE_DROPPED.inc()
+            self.unsubscribe(subscription)
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(None)
+
+    def publish(self, topic: str, event: str, data: Dict[str, Any]) -> None:
+        event_id = self._next_id
+        self._next_id += 1
+        payload = encode_event(event_id, event, data)
+        self._history.append((event_id, topic, data, payload))
+        SSE_PUBLISHED.inc((topic,))
+
+        candidates = list(self._by_topic.get(topic, ()))
+        if topic == "properties":
+            candidates.extend(self._by_type.get((topic, str(data.get("property_type", "")).lower()), ()))
+        for subscription in candidates:
+            if subscription.matches(topic, data):
+                self._deliver(subscription, payload)
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[bytes]:
+        try:
+            # Tell EventSource how long to wait before reconnecting
+            yield b"retry: 3000\n\n"
+            while True:
+                payload = await subscription.queue.get()
+                if payload is None:
+                    return
+                yield payload
+        finally:
+            self.unsubscribe(subscription)
+
+    async def _send_heartbeats(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            for subscription in list(self._subscribers):
+                if subscription.queue.empty():
+                    self._deliver(subscription, HEARTBEAT)
+
+    def start(self) -> None:
+        if self._heartbeat is None:
+            self._heartbeat = asyncio.create_task(self._send_heartbeats())
+
+    def stop(self) -> None:
+        """Stop heartbeats and end every open stream"""
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        for subscription in list(self._subscribers):
+            self.unsubscribe(subscription)
+            if subscription.queue.full():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(None)
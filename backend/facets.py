@@ -0,0 +1,208 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Inclusive lower bound, exclusive upper bound, label
+PRICE_BANDS: List[Tuple[int, Optional[int], str]] = [
+    (0, 50_000, "0-50000"),
+    (50_000, 100_000, "50000-100000"),
+    (100_000, 500_000, "100000-500000"),
+    (500_000, 1_000_000, "500000-1000000"),
+    (1_000_000, 5_000_000, "1000000-5000000"),
+    (5_000_000, None, "5000000+"),
+]
+
+FACETS = ("property_type", "bedrooms", "price_band")
+
+_BAND_ORDER = {label: i for i, (_, _, label) in enumerate(PRICE_BANDS)}
+
+
+def price_band(price: int) -> str:
+    for low, high, label in PRICE_BANDS:
+        if price >= low and (high is None or price < high):
+            return label
+    return PRICE_BANDS[0][2]
+
+
+class Bitmap:
+    """
+    Mutable bitset with O(1) set/clear and a cached integer form.
+
+    Intersections and popcounts run on the integer form (C-speed bitwise
+    ops over the whole set); it is rebuilt only after a modification.
+    """
+
+    __slots__ = ("_bits", "_int")
+
+    def __init__(self):
+        self._bits = bytearray()
+        self._int: Optional[int] = 0
+
+    def set(self, pos: int) -> None:
+        byte = pos >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(max(byte + 1 - len(self._bits), len(self._bits))))
+        self._bits[byte] |= 1 << (pos & 7)
+        self._int = None
+
+    def clear(self, pos: int) -> None:
+        byte = pos >> 3
+        if byte < len(self._bits):
+            self._bits[byte] &= ~(1 << (pos & 7)) & 0xFF
+            self._int = None
+
+    def to_int(self) -> int:
+        if self._int is None:
+            self._int = int.from_bytes(self._bits, "little")
+        return self._int
+
+    @staticmethod
+    def from_positions(positions: Iterable[int]) -> int:
+        bits = bytearray()
+        for pos in positions:
+            byte = pos >> 3
+            if byte >= len(bits):
+                bits.extend(bytes(byte + 1 - len(bits)))
+            bits[byte] |= 1 << (pos & 7)
+        return int.from_bytes(bits, "little")
+
+
+class FacetIndex:
+    """
+    Per-facet bitmaps over property positions plus a sorted price column.
+
+    Filters resolve to bitmap intersections, and the counts for every
+    facet value are popcounts of (value bitmap & filter bitmap), so one
+    request computes all facets without touching the records. Global
+    (unfiltered) counts are kept incrementally as properties come and go.
+    """
+
+    def __init__(self):
+        self._positions: Dict[str, int] = {}
+        self._next_pos = 0
+        # Positions released by removals; reused so bitmaps stay as wide as
+        # the live catalog rather than the total number of writes
+        self._free: List[int] = []
+        self._live = Bitmap()
+        self._bitmaps: Dict[str, Dict[Any, Bitmap]] = {facet: {} for facet in FACETS}
+        self._counts: Dict[str, Counter] = {facet: Counter() for facet in FACETS}
+        self._type_labels: Dict[str, str] = {}
+        self._prices: List[Tuple[int, int]] = []
+        self._values: Dict[str, Tuple[Any, Any, Any, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _facet_values(self, prop: Dict[str, Any]) -> Tuple[str, int, str]:
+        type_key = prop["property_type"].lower()
+        self._type_labels.setdefault(type_key, prop["property_type"])
+        return type_key, prop["bedrooms"], price_band(prop["price"])
+
+    def add(self, prop: Dict[str, Any]) -> None:
+        prop_id = prop["id"]
+        if prop_id in self._positions:
+            self.remove(prop_id)
+
+        if self._free:
+            pos = self._free.pop()
+        else:
+            pos = self._next_pos
+            self._next_pos += 1
+        self._positions[prop_id] = pos
+        self._live.set(pos)
+
+        values = self._facet_values(prop)
+        for facet, value in zip(FACETS, values):
+            bitmap = self._bitmaps[facet].get(value)
+            if bitmap is None:
+                bitmap = self._bitmaps[facet][value] = Bitmap()
+            bitmap.set(pos)
+            self._counts[facet][value] += 1
+
+        insort(self._prices, (prop["price"], pos))
+        self._values[prop_id] = values + (prop["price"],)
+
+    def remove(self, prop_id: str) -> None:
+        pos = self._positions.pop(prop_id, None)
+        if pos is None:
+            return
+        self._live.clear(pos)
+
+        *values, price = self._values.pop(prop_id)
+        for facet, value in zip(FACETS, values):
+            self._bitmaps[facet][value].clear(pos)
+            self._counts[facet][value] -= 1
+            if not self._counts[facet][value]:
+                del self._counts[facet][value]
+                del self._bitmaps[facet][value]
+
+        index = bisect_left(self._prices, (price, pos))
+        if index < len(self._prices) and self._prices[index] == (price, pos):
+            del self._prices[index]
+        self._free.append(pos)
+
+    @staticmethod
+    def _ordered(facet: str, values: Iterable[Any]) -> List[Any]:
+        if facet == "price_band":
+            return sorted(values, key=_BAND_ORDER.__getitem__)
+        return sorted(values)
+
+    def _label(self, facet: str, value: Any) -> str:
+        if facet == "property_type":
+            return self._type_labels.get(value, value)
+        return str(value)
+
+    def filter_bitmap(
+        self,
+        property_type: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        bedrooms: Optional[int] = None,
+    ) -> Optional[int]:
+        """Bitmap of live positions matching the filters, or None when unfiltered"""
+        result = None
+
+        if property_type:
+            bitmap = self._bitmaps["property_type"].get(property_type.lower())
+            result = bitmap.to_int() if bitmap else 0
+
+        if bedrooms is not None:
+            # Same semantics as /properties: at least this many bedrooms
+            union = 0
+            for value, bitmap in self._bitmaps["bedrooms"].items():
+                if value >= bedrooms:
+                    union |= bitmap.to_int()
+            result = union if result is None else result & union
+
+        if min_price is not None or max_price is not None:
+            lo = 0 if min_price is None else bisect_left(self._prices, (min_price, -1))
+            hi = len(self._prices) if max_price is None else bisect_right(self._prices, (max_price, float("inf")))
+            prices = Bitmap.from_positions(pos for _, pos in self._prices[lo:hi])
+            result = prices if result is None else result & prices
+
+        if result is not None:
+            result &= self._live.to_int()
+        return result
+
+    def counts(self, **filters) -> Dict[str, Any]:
+        """Counts for every facet value under the given filters, in one pass"""
+        selected = self.filter_bitmap(**filters)
+
+        if selected is None:
+            return {
+                "total": len(self._positions),
+                "facets": {
+                    facet: {self._label(facet, v): counter[v] for v in self._ordered(facet, counter)}
+                    for facet, counter in self._counts.items()
+                },
+            }
+
+        facets = {}
+        for facet, bitmaps in self._bitmaps.items():
+            facet_counts = {}
+            for value in self._ordered(facet, bitmaps):
+                n = (bitmaps[value].to_int() & selected).bit_count()
+                if n:
+                    facet_counts[self._label(facet, value)] = n
+            facets[facet] = facet_counts
+        return {"total": selected.bit_count(), "facets": facets}
@@ -0,0 +1,135 @@
+import re
+from typing import Any, Callable, Dict, Iterable, List
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+# Parser output that describes the query itself rather than a property field
+META_KEYS = frozenset({
+    "city", "area", "landmark", "location_type", "location_relation",
+    "proximity", "room_type", "price_indicator",
+})
+
+PROPERTY_TYPE_ALIASES = {"flat": "apartment"}
+
+AMENITY_FIELDS = ("description", "title", "amenities")
+
+
+def _to_int(value: Any):
+    try:
+        return int(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def price_bounds(entities: Dict[str, Any]):
+    """Translate the parser's price entities into an inclusive (low, high) range"""
+    low, high = None, None
+
+    price_range = entities.get("price_range")
+    if price_range:
+        match = re.fullmatch(r"\s*(\d+)\s*-\s*(\d+)\s*", str(price_range))
+        if match:
+            low, high = int(match.group(1)), int(match.group(2))
+        else:
+            match = re.fullmatch(r"\s*under\s+(\d+)\s*", str(price_range))
+            if match:
+                high = int(match.group(1))
+
+    # A bare budget ("15000 ksh") is treated as an upper bound
+    for key in ("max_price", "price"):
+        if key in entities:
+            value = _to_int(entities[key])
+            if value is not None:
+                high = value if high is None else min(high, value)
+
+    return low, high
+
+
+def canonical_filters(entities: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The normalized inputs the predicates actually test.
+
+    Aliased property types are resolved, bedrooms/bathrooms become ints,
+    the price entities collapse to one ``(low, high)`` range, and text
+    needles are lowercased (amenities sorted). Entities that yield no
+    predicate are left out, so two phrasings with the same canonical form
+    always filter identically.
+    """
+    canonical: Dict[str, Any] = {}
+    handled = set(META_KEYS) | {"price_range", "max_price", "price"}
+
+    property_type = entities.get("property_type")
+    if property_type:
+        handled.add("property_type")
+        needle = str(property_type).lower()
+        canonical["property_type"] = PROPERTY_TYPE_ALIASES.get(needle, needle)
+
+    for key in ("bedrooms", "bathrooms"):
+        if key in entities:
+            handled.add(key)
+            wanted = _to_int(entities[key])
+            if wanted is not None:
+                canonical[key] = wanted
+
+    low, high = price_bounds(entities)
+    if low is not None or high is not None:
+        canonical["price"] = (low, high)
+
+    location = entities.get("location")
+    if location:
+        handled.add("location")
+        canonical["location"] = str(location).lower()
+
+    amenities = entities.get("amenities")
+    if amenities:
+        handled.add("amenities")
+        canonical["amenities"] = sorted({str(a).lower() for a in amenities})
+
+    for key, value in entities.items():
+        if key in handled or not value:
+            continue
+        canonical[key] = str(value).lower()
+
+    return canonical
+
+
+def compile_filters(entities: Dict[str, Any]) -> List[Predicate]:
+    """
+    Turn parsed query entities into property predicates.
+
+    Known entities map onto typed comparisons (bedrooms are exact, prices
+    are ranges, locations and types are case-insensitive substrings).
+    Unknown keys fall back to a substring match on the field of the same
+    name; keys in META_KEYS are ignored.
+    """
+    predicates: List[Predicate] = []
+    for key, wanted in canonical_filters(entities).items():
+        if key == "property_type":
+            predicates.append(lambda p, needle=wanted: needle in p["property_type"].lower())
+        elif key in ("bedrooms", "bathrooms"):
+            predicates.append(lambda p, key=key, wanted=wanted: p[key] == wanted)
+        elif key == "price":
+            low, high = wanted
+            if low is not None:
+                predicates.append(lambda p, low=low: p["price"] >= low)
+            if high is not None:
+                predicates.append(lambda p, high=high: p["price"] <= high)
+        elif key == "location":
+            predicates.append(lambda p, needle=wanted: needle in p["location"].lower())
+        elif key == "amenities":
+            predicates.append(
+                lambda p, wanted=wanted: all(
+                    any(a in str(p.get(field, "")).lower() for field in AMENITY_FIELDS)
+                    for a in wanted
+                )
+            )
+        else:
+            predicates.append(lambda p, key=key, needle=wanted: needle in str(p.get(key, "")).lower())
+    return predicates
+
+
+def apply_filters(properties: Iterable[Dict[str, Any]], predicates: List[Predicate]) -> List[Dict[str, Any]]:
+    """Return the properties passing every predicate, in catalog order"""
+    if not predicates:
+        return list(properties)
+    return [p for p in properties if all(pred(p) for pred in predicates)]
@@ -0,0 +1,164 @@
+import re
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent swaps).
+
+    Returns ``max_distance + 1`` as soon as the distance is known to
+    exceed ``max_distance``.
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    prev_prev = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(prev[j] + 1, current[j - 1] + 1, prev[j - 1] + cost)
+            if (
+                prev_prev is not None and i > 1 and j > 1
+                and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+            ):
+                value = min(value, prev_prev[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        prev_prev, prev = prev, current
+    return prev[-1]
+
+
+def allowed_distance(word: str) -> int:
+    """Edits tolerated for a word: none below 4 chars, 1 up to 5, 2 beyond"""
+    return max(0, min(2, (len(word) - 2) // 2))
+
+
+def strict_distance(word: str) -> int:
+    """Edits tolerated when rewriting free text: as allowed_distance, but at most one below 7 chars"""
+    distance = allowed_distance(word)
+    return min(distance, 1) if len(word) < 7 else distance
+
+
+class SymSpellIndex:
+    """
+    Symmetric-delete spelling index (SymSpell).
+
+    Every known term is stored under all strings obtained by deleting up to
+    ``max_distance`` characters from its prefix. A lookup generates the
+    same deletions of the input and only verifies the few terms sharing
+    one, so correcting a token never scans the whole vocabulary.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._terms: Dict[str, int] = {}
+        self._deletes: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._terms
+
+    def _variants(self, word: str) -> Set[str]:
+        word = word[:self.prefix_length]
+        variants = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            next_frontier = set()
+            for w in frontier:
+                for i in range(len(w)):
+                    next_frontier.add(w[:i] + w[i + 1:])
+            variants |= next_frontier
+            frontier = next_frontier
+        return variants
+
+    def add(self, term: str, count: int = 1) -> None:
+        term = term.lower()
+        if term in self._terms:
+            self._terms[term] += count
+            return
+        self._terms[term] = count
+        for variant in self._variants(term):
+            self._deletes.setdefault(variant, set()).add(term)
+
+    def add_words(self, text: str) -> None:
+        """Add every word of a free-text field (e.g. a property location)"""
+        for word in _WORD_RE.findall(text.lower()):
+            if len(word) > 2:
+                self.add(word)
+
+    def lookup(self, word: str, max_distance: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """Closest known term as (term, distance); ties go to the more frequent term"""
+        word = word.lower()
+        if word in self._terms:
+            return word, 0
+        if max_distance is None:
+            max_distance = allowed_distance(word)
+        max_distance = min(max_distance, self.max_distance)
+        if max_distance <= 0:
+            return None
+
+        candidates = set()
+        for variant in self._variants(word):
+            candidates.update(self._deletes.get(variant, ()))
+
+        best = None
+        for term in candidates:
+            distance = edit_distance(word, term, max_distance)
+            if distance > max_distance:
+                continue
+            key = (distance, -self._terms[term], term)
+            if best is None or key < best[0]:
+                best = (key, term, distance)
+        return (best[1], best[2]) if best else None
+
+    def correct(self, word: str) -> str:
+        match = self.lookup(word)
+        return match[0] if match else word
+
+    def correct_text(self, text: str, skip: Iterable[str] = ()) -> Tuple[str, Dict[str, str]]:
+        """
+        Correct the words of a place phrase; returns the new text and the corrections made.
+
+        Words are corrected within :func:`strict_distance`, and the phrase is
+        only rewritten when every word of the result is a known term. A
+        correctly spelled place the index has never seen ("kikuyu") is left
+        as typed instead of being turned into a different town.
+        """
+        skip = set(skip)
+        corrections = {}
+        text = text.lower()
+        words = _WORD_RE.findall(text)
+        if all(word in skip or word in self._terms for word in words):
+            return text, corrections
+
+        resolved = True
+
+        def replace(match):
+            nonlocal resolved
+            word = match.group(0)
+            if word in skip:
+                return word
+            found = self.lookup(word, strict_distance(word))
+            if found is None:
+                resolved = False
+                return word
+            if found[0] != word:
+                corrections[word] = found[0]
+            return found[0]
+
+        corrected = _WORD_RE.sub(replace, text)
+        if not resolved:
+            return text, {}
+        return corrected, corrections
@@ -0,0 +1,51 @@
+# Static place names shared by the query parser and the search indexes.
+# Kept free of heavy imports so indexes can use them without loading spaCy.
+
+# Common Kenyan locations and universities
+KENYAN_LOCATIONS = frozenset({
+    'nairobi', 'mombasa', 'kisumu', 'nakuru', 'eldoret', 'thika', 'malindi',
+    'lamu', 'naivasha', 'kakamega', 'kisii', 'nyeri', 'meru', 'garissa',
+    'westlands', 'kileleshwa', 'lavington', 'kilimani', 'karen', 'rongai'
+})
+
+KENYAN_UNIVERSITIES = frozenset({
+    'university of nairobi', 'kenyatta university', 'moi university', 'jkuat',
+    'strathmore university', 'mount kenya university', 'technical university',
+    'murang\'a university', 'kisumu university', 'maseno university'
+})
+
+# Approximate (latitude, longitude) of gazetteer places, used for "near" queries
+LANDMARK_COORDINATES = {
+    # Towns and estates
+    'nairobi': (-1.2864, 36.8172),
+    'mombasa': (-4.0435, 39.6682),
+    'kisumu': (-0.0917, 34.7680),
+    'nakuru': (-0.3031, 36.0800),
+    'eldoret': (0.5143, 35.2698),
+    'thika': (-1.0333, 37.0693),
+    'malindi': (-3.2192, 40.1169),
+    'lamu': (-2.2717, 40.9020),
+    'naivasha': (-0.7167, 36.4333),
+    'kakamega': (0.2827, 34.7519),
+    'kisii': (-0.6817, 34.7667),
+    'nyeri': (-0.4201, 36.9476),
+    'meru': (0.0463, 37.6559),
+    'garissa': (-0.4532, 39.6461),
+    'westlands': (-1.2676, 36.8108),
+    'kileleshwa': (-1.2833, 36.7833),
+    'lavington': (-1.2780, 36.7690),
+    'kilimani': (-1.2921, 36.7856),
+    'karen': (-1.3190, 36.7073),
+    'rongai': (-1.3960, 36.7440),
+    # Universities
+    'university of nairobi': (-1.2798, 36.8163),
+    'kenyatta university': (-1.1803, 36.9293),
+    'moi university': (0.2870, 35.2950),
+    'jkuat': (-1.0912, 37.0117),
+    'strathmore university': (-1.3096, 36.8123),
+    'mount kenya university': (-1.0450, 37.0781),
+    'technical university': (-1.2915, 36.8258),
+    'murang\'a university': (-0.7166, 37.1474),
+    'kisumu university': (-0.0960, 34.7560),
+    'maseno university': (-0.0037, 34.6063),
+}
@@ -0,0 +1,103 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+from gazetteer import LANDMARK_COORDINATES
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def resolve_landmark(text: str) -> Optional[Tuple[str, Tuple[float, float]]]:
+    """
+    Find gazetteer coordinates for a landmark phrase.
+
+    Exact names win; otherwise the longest gazetteer name contained in the
+    phrase is used ("the university of nairobi main campus").
+    """
+    text = text.strip().lower()
+    if text in LANDMARK_COORDINATES:
+        return text, LANDMARK_COORDINATES[text]
+    contained = [name for name in LANDMARK_COORDINATES if name in text]
+    if not contained:
+        return None
+    name = max(contained, key=len)
+    return name, LANDMARK_COORDINATES[name]
+
+
+class GridIndex:
+    """
+    Uniform lat/lng grid for radius queries.
+
+    Points are bucketed into cells of ``cell_km``; a radius query visits only
+    the cells overlapping the circle's bounding box and checks exact
+    haversine distances there. Inserts and removals are O(1), so the index
+    stays current as listings change without rebuilding a tree.
+    """
+
+    def __init__(self, cell_km: float = 2.0):
+        self.cell_deg = cell_km / KM_PER_DEGREE_LAT
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._points: Dict[str, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    def add(self, key: str, lat: float, lng: float) -> None:
+        if key in self._points:
+            self.remove(key)
+        self._points[key] = (lat, lng)
+        self._cells.setdefault(self._cell(lat, lng), set()).add(key)
+
+    def remove(self, key: str) -> None:
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell(*point)
+        members = self._cells[cell]
+        members.discard(key)
+        if not members:
+            del self._cells[cell]
+
+    def within(self, lat: float, lng: float, radius_km: float,
+               limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(key, distance_km) pairs within ``radius_km``, nearest first"""
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        # Longitude degrees shrink towards the poles
+        lng_span = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        min_i, min_j = self._cell(lat - lat_span, lng - lng_span)
+        max_i, max_j = self._cell(lat + lat_span, lng + lng_span)
+
+        hits = []
+        if (max_i - min_i + 1) * (max_j - min_j + 1) > len(self._cells):
+            # Huge radius: cheaper to walk the occupied cells than the box
+            cells = [members for (i, j), members in self._cells.items()
+                     if min_i <= i <= max_i and min_j <= j <= max_j]
+        else:
+            cells = [self._cells[(i, j)]
+                     for i in range(min_i, max_i + 1)
+                     for j in range(min_j, max_j + 1)
+                     if (i, j) in self._cells]
+
+        points = self._points
+        for members in cells:
+            for key in members:
+                distance = haversine_km(lat, lng, *points[key])
+                if distance <= radius_km:
+                    hits.append((key, distance))
+
+        if limit is not None:
+            return heapq.nsmallest(limit, hits, key=lambda hit: hit[1])
+        hits.sort(key=lambda hit: hit[1])
+        return hits
@@ -0,0 +1,70 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# "import time:      self [us] | cumulative | imported package"
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Modules whose presence in a CRUD-only boot means the lazy NLP facade leaked
+HEAVY_MODULES = ("spacy", "thinc", "torch")
+
+
+def profile_imports(module: str, env: Dict[str, str]) -> List[Tuple[str, int, int, int]]:
+    """Run ``python -X importtime -c "import <module>"`` and parse its report"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def report(rows: List[Tuple[str, int, int, int]], top: int) -> None:
+    total_us = sum(self_us for _, self_us, _, _ in rows)
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"Total import time: {total_us / 1000:.1f} ms over {len(rows)} modules\n")
+    print(f"{'package':<32}{'self ms':>10}{'share':>8}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}{self_us / total_us:>8.1%}")
+
+    print(f"\n{'slowest modules (cumulative)':<48}{'ms':>10}")
+    for name, _, cumulative_us, _ in sorted(rows, key=lambda row: -row[2])[:top]:
+        print(f"{name:<48}{cumulative_us / 1000:>10.1f}")
+
+    leaked = sorted({name.split(".")[0] for name, *_ in rows} & set(HEAVY_MODULES))
+    print()
+    print(f"Heavy modules imported: {', '.join(leaked)}" if leaked else "No heavy NLP modules imported")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report where import time goes when loading the API")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--with-nlp", action="store_true",
+                        help="Also import the NLP parser, to compare against the lazy default")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    module = args.module
+    if args.with_nlp:
+        module = f"{module}, search"
+    report(profile_imports(module, env), args.top)
+
+
+if __name__ == "__main__":
+    main()
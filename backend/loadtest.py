@@ -0,0 +1,328 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# Scenario name -> relative weight in the default request mix
+DEFAULT_MIX = {
+    "properties": 4,
+    "properties_filtered": 4,
+    "property_by_id": 4,
+    "posts": 2,
+    "user_by_id": 2,
+    "search": 2,
+    "nlp_search": 2,
+    "suggest": 2,
+}
+
+NLP_QUERIES = [
+    "2 bedroom apartment in kilimani",
+    "villa under 3000000",
+    "apartment near jkuat",
+    "condo with pool",
+    "3 bedroom house in westlands under 15000000",
+    "bedsitter in rongai",
+]
+SUGGEST_PREFIXES = ["ki", "apa", "we", "vil", "ro", "lux"]
+POST_TERMS = ["home", "renovation", "tips", "buying", "investment"]
+PROPERTY_TYPES = ["apartment", "villa", "condo", "townhouse", "bungalow"]
+
+Request = Tuple[str, str, Dict[str, Any]]
+
+
+class Scenarios:
+    """Builds requests for each scenario from ids sampled off the running app"""
+
+    def __init__(self, rng: random.Random, property_ids: List[str], user_ids: List[str]):
+        self.rng = rng
+        self.property_ids = property_ids or ["1"]
+        self.user_ids = user_ids or ["1"]
+
+    def build(self, name: str) -> Request:
+        rng = self.rng
+        if name == "properties":
+            return "GET", "/properties", {"skip": rng.randrange(0, 50), "limit": 20}
+        if name == "properties_filtered":
+            low = rng.choice([0, 500_000, 1_000_000, 5_000_000])
+            return "GET", "/properties", {
+                "property_type": rng.choice(PROPERTY_TYPES),
+                "min_price": low,
+                "max_price": low * 4 + 1_000_000,
+                "limit": 20,
+            }
+        if name == "property_by_id":
+            return "GET", f"/properties/{rng.choice(self.property_ids)}", {}
+        if name == "posts":
+            return "GET", "/posts", {"skip": rng.randrange(0, 20), "limit": 10}
+        if name == "user_by_id":
+            return "GET", f"/users/{rng.choice(self.user_ids)}", {}
+        if name == "search":
+            return "GET", "/search", {"q": rng.choice(POST_TERMS)}
+        if name == "nlp_search":
+            return "GET", "/search-properties/v2/nlp-search", {"query": rng.choice(NLP_QUERIES)}
+        if name == "suggest":
+            return "GET", "/search-properties/v2/suggest", {"q": rng.choice(SUGGEST_PREFIXES)}
+        raise ValueError(f"Unknown scenario: {name}")
+
+
+def parse_mix(text: Optional[str]) -> Dict[str, float]:
+    """Parse "name=weight,name=weight" into a mix; names without a weight count 1"""
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], elapsed: float, statuses: Counter) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    to_ms = 1000.0
+    return {
+        "requests": len(ordered),
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * to_ms, 3),
+        "p90_ms": round(percentile(ordered, 90) * to_ms, 3),
+        "p99_ms": round(percentile(ordered, 99) * to_ms, 3),
+        "max_ms": round((ordered[-1] if ordered else 0.0) * to_ms, 3),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def sample_ids(client: httpx.AsyncClient) -> Tuple[List[str], List[str]]:
+    properties = (await client.get("/properties", params={"limit": 100})).json()
+    users = (await client.get("/users", params={"limit": 100})).json()
+    return [p["id"] for p in properties], [u["id"] for u in users]
+
+
+async def run_load(client: httpx.AsyncClient, scenarios: Scenarios, mix: Dict[str, float],
+                   total: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    plan = scenarios.rng.choices(names, weights=weights, k=total + warmup)
+    requests = [(name, scenarios.build(name)) for name in plan]
+
+    for name, (method, url, params) in requests[:warmup]:
+        await client.request(method, url, params=params)
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    queue = iter(requests[warmup:])
+
+    async def worker():
+        for name, (method, url, params) in queue:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, params=params)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = "error"
+            latencies[name].append(time.perf_counter() - started)
+            statuses[name][status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    all_statuses = sum(statuses.values(), Counter())
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "overall": summarize(all_latencies, elapsed, all_statuses),
+        # Per-endpoint rps is its share of the run, not its standalone throughput
+        "endpoints": {
+            name: summarize(latencies[name], elapsed, statuses[name]) for name in sorted(latencies)
+        },
+    }
+
+
+async def measure_allocations(client: httpx.AsyncClient, scenarios: Scenarios,
+                              mix: Dict[str, float], samples: int) -> Dict[str, Any]:
+    """
+    Per-scenario memory cost with tracemalloc, measured sequentially.
+
+    ``peak_kib`` is the transient high-water mark a single request adds and
+    ``retained_bytes`` what stays allocated afterwards (growing caches or
+    leaks). Tracing slows everything down, so this runs after the timed load.
+    """
+    results = {}
+    tracemalloc.start()
+    try:
+        for name in mix:
+            peaks, retained = [], []
+            for _ in range(samples):
+                method, url, params = scenarios.build(name)
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                await client.request(method, url, params=params)
+                after, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - before)
+                retained.append(after - before)
+            results[name] = {
+                "peak_kib": round(sum(peaks) / len(peaks) / 1024, 1),
+                "retained_bytes": round(sum(retained) / len(retained)),
+            }
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_asgi(args, mix) -> Dict[str, Any]:
+    from app import app
+
+    # ASGITransport does not send lifespan events, so run startup directly
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            scenarios = Scenarios(random.Random(args.seed), *await sample_ids(client))
+            report = await run_load(client, scenarios, mix, args.requests, args.concurrency, args.warmup)
+            if args.alloc_samples:
+                report["allocations"] = await measure_allocations(client, scenarios, mix, args.alloc_samples)
+    finally:
+        await app.router.shutdown()
+    return report
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("uvicorn did not become healthy in time")
+
+
+async def run_uvicorn(args, mix) -> Dict[str, Any]:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1",
+         "--port", str(args.port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits) as client:
+            await wait_until_healthy(client, args.startup_timeout)
+            scenarios = Scenarios(random.Random(args.seed), *await sample_ids(client))
+            return await run_load(client, scenarios, mix, args.requests, args.concurrency, args.warmup)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Human-readable regressions of ``report`` against ``baseline``"""
+    regressions = []
+    sections = [("overall", report["overall"], baseline.get("overall", {}))]
+    sections += [
+        (name, stats, baseline.get("endpoints", {}).get(name, {}))
+        for name, stats in report["endpoints"].items()
+    ]
+    for name, current, previous in sections:
+        if not previous:
+            continue
+        if previous.get("rps") and current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+        for key in ("p50_ms", "p99_ms"):
+            if previous.get(key) and current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {previous[key]} -> {current[key]}")
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    header = f"{'endpoint':<22}{'requests':>9}{'rps':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    print(header)
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for name, stats in rows:
+        print(f"{name:<22}{stats['requests']:>9}{stats['rps']:>10}{stats['p50_ms']:>9}"
+              f"{stats['p90_ms']:>9}{stats['p99_ms']:>9}{stats['max_ms']:>9}")
+    for name, alloc in report.get("allocations", {}).items():
+        print(f"{name:<22}peak {alloc['peak_kib']} KiB/request, retained {alloc['retained_bytes']} B/request")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the API in-process or over a local uvicorn socket")
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--requests", type=int, default=2000, help="Timed requests in total")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--mix", help="Scenario weights, e.g. nlp_search=3,property_by_id=1")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--alloc-samples", type=int, default=20,
+                        help="Requests per scenario traced for allocations (asgi mode; 0 disables)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--save", help="Write the report as a JSON baseline to this path")
+    parser.add_argument("--compare", help="Baseline JSON to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    runner = run_asgi if args.mode == "asgi" else run_uvicorn
+    report = asyncio.run(runner(args, mix))
+    report["meta"] = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "mode": args.mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "mix": mix,
+        "seed": args.seed,
+        "synthetic": {key: os.environ[key] for key in
+                      ("SYNTHETIC_USERS", "SYNTHETIC_POSTS", "SYNTHETIC_PROPERTIES") if key in os.environ},
+    }
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against", args.compare)
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print("No regressions against", args.compare)
+
+
+if __name__ == "__main__":
+    main()
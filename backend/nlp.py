@@ -0,0 +1,86 @@
+import asyncio
+import importlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from metrics import REGISTRY
+
+# Facade over the spaCy query parser in search.py. Importing spaCy costs
+# seconds and a lot of memory, so nothing here touches it until the first
+# NLP query (or an explicit preload). NLP_ENABLED=0 turns it off entirely.
+
+NLP_LOAD_SECONDS = REGISTRY.gauge(
+    "nlp_parser_load_seconds", "Time spent importing the NLP query parser and loading its model"
+)
+
+_parser: Optional[Callable] = None
+_parser_class = None
+_lock = threading.Lock()
+
+# Parser metrics are registered here rather than in search.py, which is
+# imported on a worker thread while /metrics may be iterating the registry
+PARSE_DURATION = REGISTRY.histogram(
+    "nlp_parse_duration_seconds",
+    "Time spent parsing a query, including executor queueing"
+)
+PARSE_CACHE_HITS = REGISTRY.counter(
+    "nlp_parse_cache_hits_total", "Parsed queries served from the parse cache"
+)
+PARSE_CACHE_MISSES = REGISTRY.counter(
+    "nlp_parse_cache_misses_total", "Parsed queries that had to run the parser"
+)
+REGISTRY.gauge(
+    "nlp_parse_cache_hit_ratio",
+    "Fraction of parse requests served from the parse cache",
+    function=lambda: PARSE_CACHE_HITS.get() / max(PARSE_CACHE_HITS.get() + PARSE_CACHE_MISSES.get(), 1)
+)
+REGISTRY.gauge(
+    "nlp_parser_executor_queue_depth",
+    "Parse jobs waiting for a parser worker thread",
+    function=lambda: _parser_class.executor_queue_depth() if _parser_class is not None else 0
+)
+
+
+class NLPDisabled(RuntimeError):
+    """Raised when NLP search is switched off by configuration"""
+
+
+def enabled() -> bool:
+    return os.environ.get("NLP_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def loaded() -> bool:
+    return _parser is not None
+
+
+def _load() -> Callable:
+    global _parser, _parser_class
+    with _lock:
+        if _parser is None:
+            started = time.perf_counter()
+            module = importlib.import_module("search")
+            # Loading the spaCy model is the expensive part; do it here, off
+            # the event loop, rather than on the first parse
+            module.AsyncPropertyQueryParser.initialize_parser()
+            NLP_LOAD_SECONDS.set(time.perf_counter() - started)
+            _parser_class = module.AsyncPropertyQueryParser
+            _parser = module.get_query_parser
+    return _parser
+
+
+async def load() -> Callable:
+    """Import the parser and load its model off the event loop; concurrent callers share one load"""
+    if not enabled():
+        raise NLPDisabled("NLP search is disabled (NLP_ENABLED=0)")
+    if _parser is not None:
+        return _parser
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _load)
+
+
+async def parse(query: str) -> Dict[str, Any]:
+    """Parse a query with the NLP parser, loading it on first use"""
+    parser = await load()
+    return await parser(query)
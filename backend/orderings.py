@@ -0,0 +1,118 @@
+import math
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from records import to_epoch
+
+# Seconds of recency worth one order of magnitude of engagement
+TRENDING_DECADE_SECONDS = 45000
+
+
+def engagement(post: Dict[str, Any]) -> int:
+    return post.get("likes", 0) + 2 * post.get("comments", 0)
+
+
+def trending_score(post: Dict[str, Any], created_ts: float) -> float:
+    """
+    Time-invariant "hot" score.
+
+    log10 of engagement plus creation time scaled by TRENDING_DECADE_SECONDS:
+    a post needs 10x the engagement to outrank one posted that much later.
+    Because the time term is fixed at creation, scores never decay and
+    the order only changes when engagement does.
+    """
+    return math.log10(max(engagement(post), 1)) + created_ts / TRENDING_DECADE_SECONDS
+
+
+class SortedIndex:
+    """
+    Keys kept in descending score order in a flat sorted list.
+
+    Inserts and removals are a bisect plus one memmove; reading a page
+    is a slice, so ``page(skip, limit)`` costs O(limit) rather than a
+    sort of the whole collection.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[float, int, str]] = []
+        self._keys: Dict[str, Tuple[float, int, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set(self, key: str, score: float, seq: int) -> None:
+        entry = (-score, seq, key)
+        old = self._keys.get(key)
+        if old == entry:
+            return
+        if old is not None:
+            self._discard(old)
+        self._keys[key] = entry
+        insort(self._entries, entry)
+
+    def _discard(self, entry: Tuple[float, int, str]) -> None:
+        index = bisect_left(self._entries, entry)
+        if index < len(self._entries) and self._entries[index] == entry:
+            del self._entries[index]
+
+    def remove(self, key: str) -> None:
+        entry = self._keys.pop(key, None)
+        if entry is not None:
+            self._discard(entry)
+
+    def page(self, skip: int = 0, limit: int = 10) -> List[str]:
+        return [key for _, _, key in self._entries[skip:skip + limit]]
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for _, _, key in self._entries)
+
+
+class PostOrders:
+    """Maintained sort orders over posts; ties keep insertion order"""
+
+    def __init__(self):
+        self._created: Dict[str, float] = {}
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._scores: Dict[str, Callable[[Dict[str, Any], float], float]] = {
+            "recent": lambda post, created_ts: created_ts,
+            "likes": lambda post, created_ts: post.get("likes", 0),
+            "comments": lambda post, created_ts: post.get("comments", 0),
+            "trending": trending_score,
+        }
+        self._indexes = {name: SortedIndex() for name in self._scores}
+
+    @property
+    def sorts(self) -> List[str]:
+        return list(self._scores)
+
+    def add(self, post: Dict[str, Any]) -> None:
+        """Index a new post, or re-score one whose engagement changed"""
+        post_id = post["id"]
+        if post_id not in self._seq:
+            self._seq[post_id] = self._next_seq
+            self._next_seq += 1
+            self._created[post_id] = to_epoch(post["created_at"])
+        created_ts, seq = self._created[post_id], self._seq[post_id]
+        for name, score in self._scores.items():
+            self._indexes[name].set(post_id, score(post, created_ts), seq)
+
+    update = add
+
+    def remove(self, post_id: str) -> None:
+        for index in self._indexes.values():
+            index.remove(post_id)
+        self._created.pop(post_id, None)
+        self._seq.pop(post_id, None)
+
+    def _index(self, sort: str) -> SortedIndex:
+        if sort not in self._indexes:
+            raise ValueError(f"Unknown sort: {sort}. Available: {', '.join(self._scores)}")
+        return self._indexes[sort]
+
+    def page(self, sort: str, skip: int = 0, limit: int = 10) -> List[str]:
+        return self._index(sort).page(skip, limit)
+
+    def iter(self, sort: str) -> Iterator[str]:
+        """All post ids in ``sort`` order, lazily (for filtered pages)"""
+        return iter(self._index(sort))
@@ -0,0 +1,62 @@
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+Plan = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class FieldProjector:
+    """
+    Sparse fieldsets for a response model (``?fields=id,title,price``).
+
+    Each distinct field list is compiled once into a projection plan built
+    on ``operator.itemgetter``, and plans are cached so repeated requests
+    for the same fieldset skip parsing and validation entirely.
+    """
+
+    def __init__(self, model: Type[BaseModel], common: Iterable[str] = (), max_plans: int = 256):
+        self.model = model
+        self.allowed = tuple(model.model_fields)
+        self.max_plans = max_plans
+        self._plans: Dict[str, Tuple[Tuple[str, ...], Plan]] = {}
+        for fields in common:
+            self.plan(fields)
+
+    def _compile(self, fields: str) -> Tuple[Tuple[str, ...], Plan]:
+        names = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        if not names:
+            raise ValueError("At least one field must be requested")
+        unknown = [name for name in names if name not in self.model.model_fields]
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(self.allowed)}"
+            )
+
+        if len(names) == 1:
+            name = names[0]
+            return names, lambda record: {name: record[name]}
+
+        getter = itemgetter(*names)
+        return names, lambda record: dict(zip(names, getter(record)))
+
+    def plan(self, fields: str) -> Plan:
+        """Return the cached projection plan for a ``fields`` parameter value"""
+        cached = self._plans.get(fields)
+        if cached is None:
+            cached = self._compile(fields)
+            if len(self._plans) >= self.max_plans:
+                self._plans.clear()
+            self._plans[fields] = cached
+        return cached[1]
+
+    def project(self, records: Iterable[Dict[str, Any]], fields: Optional[str]) -> List[Dict[str, Any]]:
+        if fields is None:
+            return list(records)
+        plan = self.plan(fields)
+        return [plan(record) for record in records]
+
+    def project_one(self, record: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+        if fields is None:
+            return record
+        return self.plan(fields)(record)
@@ -285,6 +285,8 @@ sample_properties= [
             "description": "Stunning 4-bedroom villa with private beach access and panoramic ocean views. Features modern amenities and spacious living areas.",
             "price": 2500000,
             "location": "Malibu, California",
+            "latitude": 34.0259,
+            "longitude": -118.7798,
             "bedrooms": 4,
             "bathrooms": 3,
             "square_feet": 3200,
@@ -300,6 +302,8 @@ sample_properties= [
             "description": "Beautiful industrial-style loft in the heart of downtown. High ceilings, exposed brick, and modern finishes throughout.",
             "price": 850000,
             "location": "New York, NY",
+            "latitude": 40.7128,
+            "longitude": -74.006,
             "bedrooms": 2,
             "bathrooms": 2,
             "square_feet": 1800,
@@ -315,6 +319,8 @@ sample_properties= [
             "description": "Cozy log cabin nestled in the mountains. Perfect for nature lovers with hiking trails and stunning views.",
             "price": 450000,
             "location": "Aspen, Colorado",
+            "latitude": 39.1911,
+            "longitude": -106.8175,
             "bedrooms": 3,
             "bathrooms": 2,
             "square_feet": 2200,
@@ -330,6 +336,8 @@ sample_properties= [
             "description": "Spacious family home in quiet neighborhood. Large backyard, updated kitchen, and excellent school district.",
             "price": 675000,
             "location": "Austin, Texas",
+            "latitude": 30.2672,
+            "longitude": -97.7431,
             "bedrooms": 5,
             "bathrooms": 3,
             "square_feet": 2800,
@@ -345,6 +353,8 @@ sample_properties= [
             "description": "Luxurious penthouse with rooftop terrace and city skyline views. High-end finishes and premium amenities.",
             "price": 3200000,
             "location": "Miami, Florida",
+            "latitude": 25.7617,
+            "longitude": -80.1918,
             "bedrooms": 3,
             "bathrooms": 3,
             "square_feet": 3500,
@@ -360,6 +370,8 @@ sample_properties= [
             "description": "Beautifully restored historic townhouse with original features and modern updates. Located in charming historic district.",
             "price": 1200000,
             "location": "Charleston, South Carolina",
+            "latitude": 32.7765,
+            "longitude": -79.9311,
             "bedrooms": 4,
             "bathrooms": 3,
             "square_feet": 2600,
@@ -375,6 +387,8 @@ sample_properties= [
             "description": "Charming cottage on pristine lake. Private dock, fishing access, and peaceful surroundings perfect for relaxation.",
             "price": 550000,
             "location": "Lake Tahoe, California",
+            "latitude": 39.0968,
+            "longitude": -120.0324,
             "bedrooms": 2,
             "bathrooms": 1,
             "square_feet": 1500,
@@ -390,6 +404,8 @@ sample_properties= [
             "description": "Sleek contemporary condo with smart home features and resort-style amenities including pool and gym.",
             "price": 725000,
             "location": "Seattle, Washington",
+            "latitude": 47.6062,
+            "longitude": -122.3321,
             "bedrooms": 2,
             "bathrooms": 2,
             "square_feet": 1400,
@@ -405,6 +421,8 @@ sample_properties= [
             "description": "Expansive single-story ranch on 5 acres. Horse barn, pool, and mature landscaping throughout the property.",
             "price": 1850000,
             "location": "Nashville, Tennessee",
+            "latitude": 36.1627,
+            "longitude": -86.7816,
             "bedrooms": 4,
             "bathrooms": 4,
             "square_feet": 4200,
@@ -420,6 +438,8 @@ sample_properties= [
             "description": "Luxury ski chalet with direct slope access. Hot tub, fireplace, and mountain views from every room.",
             "price": 2900000,
             "location": "Park City, Utah",
+            "latitude": 40.6461,
+            "longitude": -111.498,
             "bedrooms": 5,
             "bathrooms": 4,
             "square_feet": 3800,
@@ -435,6 +455,8 @@ sample_properties= [
             "description": "Architectural masterpiece with floor-to-ceiling windows overlooking the water. Infinity pool and private beach.",
             "price": 4200000,
             "location": "San Diego, California",
+            "latitude": 32.7157,
+            "longitude": -117.1611,
             "bedrooms": 4,
             "bathrooms": 4,
             "square_feet": 4500,
@@ -450,6 +472,8 @@ sample_properties= [
             "description": "Sophisticated apartment with stunning city views. Walking distance to restaurants, shops, and entertainment.",
             "price": 950000,
             "location": "Chicago, Illinois",
+            "latitude": 41.8781,
+            "longitude": -87.6298,
             "bedrooms": 2,
             "bathrooms": 2,
             "square_feet": 1600,
@@ -465,6 +489,8 @@ sample_properties= [
             "description": "Renovated farmhouse with original charm and modern comforts. Large porch, barn, and rolling hills.",
             "price": 890000,
             "location": "Lancaster, Pennsylvania",
+            "latitude": 40.0379,
+            "longitude": -76.3055,
             "bedrooms": 3,
             "bathrooms": 2,
             "square_feet": 2400,
@@ -480,6 +506,8 @@ sample_properties= [
             "description": "Minimalist desert home with private courtyard and mountain views. Sustainable design and solar powered.",
             "price": 1250000,
             "location": "Scottsdale, Arizona",
+            "latitude": 33.4942,
+            "longitude": -111.9261,
             "bedrooms": 3,
             "bathrooms": 2,
             "square_feet": 2200,
@@ -495,6 +523,8 @@ sample_properties= [
             "description": "Grand Victorian mansion with period details and modern updates. Wraparound porch and carriage house.",
             "price": 2750000,
             "location": "San Francisco, California",
+            "latitude": 37.7749,
+            "longitude": -122.4194,
             "bedrooms": 6,
             "bathrooms": 4,
             "square_feet": 5200,
@@ -511,6 +541,8 @@ sample_properties= [
         "description": "Elegant condo in the financial district with concierge service, gym, and stunning skyline views. Perfect for urban professionals.",
         "price": 1100000,
         "location": "Boston, Massachusetts",
+        "latitude": 42.3601,
+        "longitude": -71.0589,
         "bedrooms": 2,
         "bathrooms": 2,
         "square_feet": 1650,
@@ -526,6 +558,8 @@ sample_properties= [
         "description": "Clean lines and open spaces define this architectural gem. Features smart home integration and a zen garden.",
         "price": 1850000,
         "location": "Portland, Oregon",
+        "latitude": 45.5152,
+        "longitude": -122.6784,
         "bedrooms": 3,
         "bathrooms": 3,
         "square_feet": 2700,
@@ -541,6 +575,8 @@ sample_properties= [
         "description": "Move-in ready home in a top-rated school zone. Features a finished basement, large deck, and two-car garage.",
         "price": 720000,
         "location": "Denver, Colorado",
+        "latitude": 39.7392,
+        "longitude": -104.9903,
         "bedrooms": 4,
         "bathrooms": 3,
         "square_feet": 3100,
@@ -556,6 +592,8 @@ sample_properties= [
         "description": "Bright corner unit with panoramic harbor views. Walking distance to marinas, shops, and fine dining.",
         "price": 950000,
         "location": "Annapolis, Maryland",
+        "latitude": 38.9784,
+        "longitude": -76.4922,
         "bedrooms": 1,
         "bathrooms": 2,
         "square_feet": 1350,
@@ -571,6 +609,8 @@ sample_properties= [
         "description": "This home blends seamlessly with its natural surroundings. Features floor-to-ceiling windows, a saltwater pool, and an outdoor kitchen.",
         "price": 2100000,
         "location": "Palm Springs, California",
+        "latitude": 33.8303,
+        "longitude": -116.5453,
         "bedrooms": 4,
         "bathrooms": 4,
         "square_feet": 3400,
@@ -586,6 +626,8 @@ sample_properties= [
         "description": "A perfect home for entertaining with an open floor plan, updated chef's kitchen, and a large, fenced backyard.",
         "price": 650000,
         "location": "Charlotte, North Carolina",
+        "latitude": 35.2271,
+        "longitude": -80.8431,
         "bedrooms": 5,
         "bathrooms": 3,
         "square_feet": 2900,
@@ -601,6 +643,8 @@ sample_properties= [
         "description": "Peaceful condo on a serene lake. Enjoy morning coffee on the balcony overlooking the water. Includes secure underground parking.",
         "price": 575000,
         "location": "Madison, Wisconsin",
+        "latitude": 43.0731,
+        "longitude": -89.4012,
         "bedrooms": 2,
         "bathrooms": 2,
         "square_feet": 1500,
@@ -616,6 +660,8 @@ sample_properties= [
         "description": "Completely renovated from top to bottom. New roof, HVAC, kitchen, and bathrooms. A turn-key property in a desirable community.",
         "price": 830000,
         "location": "Atlanta, Georgia",
+        "latitude": 33.749,
+        "longitude": -84.388,
         "bedrooms": 4,
         "bathrooms": 3,
         "square_feet": 2600,
@@ -0,0 +1,117 @@
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "at", "by", "for", "from", "i", "in", "is", "it",
+    "looking", "me", "my", "near", "need", "of", "on", "or", "the", "to",
+    "want", "with", "within", "find", "show", "some", "any",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens with stopwords removed"""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring over selected record fields.
+
+    Field weights scale term frequencies (a title hit counts more than a
+    description hit). Documents can be added and removed incrementally;
+    idf and average length are derived from running totals at query time.
+    """
+
+    DEFAULT_FIELDS = {"title": 2.0, "description": 1.0, "location": 1.5}
+
+    def __init__(self, fields: Optional[Dict[str, float]] = None, k1: float = 1.2, b: float = 0.75):
+        self.fields = fields or dict(self.DEFAULT_FIELDS)
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._doc_len: Dict[str, float] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._total_len = 0.0
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_len
+
+    def add(self, doc_id: str, record: Dict[str, Any]) -> None:
+        if doc_id in self._doc_len:
+            self.remove(doc_id)
+
+        frequencies: Dict[str, float] = defaultdict(float)
+        length = 0.0
+        for field, weight in self.fields.items():
+            tokens = tokenize(str(record.get(field, "")))
+            length += weight * len(tokens)
+            for token in tokens:
+                frequencies[token] += weight
+
+        for term, tf in frequencies.items():
+            self._postings[term][doc_id] = tf
+        self._doc_terms[doc_id] = tuple(frequencies)
+        self._doc_len[doc_id] = length
+        self._total_len += length
+
+    def remove(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id)
+
+    def scores(self, query: str, candidates: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        BM25 score of every document matching at least one query term.
+
+        When ``candidates`` is given only those documents are scored; the
+        smaller of each posting list and the candidate set is iterated.
+        """
+        n = len(self._doc_len)
+        if not n:
+            return {}
+        if candidates is not None and not isinstance(candidates, (set, frozenset, dict)):
+            candidates = set(candidates)
+
+        avg_len = self._total_len / n or 1.0
+        k1, b = self.k1, self.b
+        doc_len = self._doc_len
+        scores: Dict[str, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+            if candidates is None:
+                hits = postings.items()
+            elif len(candidates) < df:
+                hits = ((d, postings[d]) for d in candidates if d in postings)
+            else:
+                hits = ((d, tf) for d, tf in postings.items() if d in candidates)
+
+            for doc_id, tf in hits:
+                norm = k1 * (1 - b + b * doc_len[doc_id] / avg_len)
+                scores[doc_id] += idf * tf * (k1 + 1) / (tf + norm)
+
+        return scores
+
+    def top_k(self, query: str, k: int, candidates: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """Best ``k`` (doc_id, score) pairs, selected with a heap rather than a full sort"""
+        scores = self.scores(query, candidates)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
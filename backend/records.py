@@ -0,0 +1,102 @@
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Response field order (matches the Property model)
+PROPERTY_FIELDS: Tuple[str, ...] = (
+    "id", "title", "description", "price", "location", "bedrooms", "bathrooms",
+    "square_feet", "property_type", "year_built", "owner_id", "created_at", "image",
+    "latitude", "longitude",
+)
+_STORED_FIELDS = frozenset(PROPERTY_FIELDS) - {"created_at"}
+# Only coordinates may be missing; every other field is indexed or required
+NULLABLE_FIELDS = frozenset(("latitude", "longitude"))
+
+# Low-cardinality strings repeated across listings share one object
+INTERNED_FIELDS = ("location", "property_type", "owner_id", "image")
+
+
+def to_epoch(timestamp: str) -> float:
+    """Naive ISO timestamp -> seconds since 1970 (microseconds round-trip exactly)"""
+    return (datetime.fromisoformat(timestamp) - _EPOCH).total_seconds()
+
+
+def from_epoch(seconds: float) -> str:
+    return (_EPOCH + timedelta(seconds=seconds)).isoformat()
+
+
+class PropertyRecord:
+    """
+    Slotted, read-only property row.
+
+    Holds the same data as a property dict at a fraction of the memory:
+    no per-record hash table, categorical strings interned and shared,
+    and ``created_at`` kept as an epoch float. It supports the read side
+    of the mapping protocol (``record["price"]``, ``.get``, ``**record``),
+    so filters and indexes use it like a dict; responses call
+    :meth:`to_dict` at serialization time.
+    """
+
+    __slots__ = (
+        "id", "title", "description", "price", "location", "bedrooms", "bathrooms",
+        "square_feet", "property_type", "year_built", "owner_id", "created_ts", "image",
+        "latitude", "longitude",
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PropertyRecord":
+        record = cls.__new__(cls)
+        for field in _STORED_FIELDS:
+            value = data.get(field)
+            if field in INTERNED_FIELDS and value is not None:
+                value = sys.intern(value)
+            object.__setattr__(record, field, value)
+        object.__setattr__(record, "created_ts", to_epoch(data["created_at"]))
+        return record
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PropertyRecord is immutable; write through the store")
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "created_at":
+            return from_epoch(self.created_ts)
+        if key in _STORED_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        return key == "created_at" or key in _STORED_FIELDS
+
+    def keys(self) -> Tuple[str, ...]:
+        return PROPERTY_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PROPERTY_FIELDS)
+
+    def __len__(self) -> int:
+        return len(PROPERTY_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"PropertyRecord(id={self.id!r}, title={self.title!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: self[field] for field in PROPERTY_FIELDS}
+
+
+def to_dicts(records) -> list:
+    """Serialize a sequence of records (or plain dicts) for a response"""
+    return [r.to_dict() if isinstance(r, PropertyRecord) else r for r in records]
+
+
+def as_record(data) -> Optional[PropertyRecord]:
+    if data is None or isinstance(data, PropertyRecord):
+        return data
+    return PropertyRecord.from_dict(data)
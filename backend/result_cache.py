@@ -0,0 +1,77 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from filters import canonical_filters
+from metrics import REGISTRY
+
+RESULT_CACHE_HITS = REGISTRY.counter(
+    "search_result_cache_hits_total", "NLP searches answered from the filter result cache"
+)
+RESULT_CACHE_MISSES = REGISTRY.counter(
+    "search_result_cache_misses_total", "NLP searches that had to run the filter pass"
+)
+
+
+class CatalogVersion:
+    """Counter bumped on every catalog write; cached results carry the version they saw"""
+
+    def __init__(self):
+        self.value = 0
+
+    def bump(self) -> int:
+        self.value += 1
+        return self.value
+
+
+def filter_key(entities: Dict[str, Any], **extra: Any) -> str:
+    """
+    Canonical hash of the filters parsed entities compile to.
+
+    The key is built from :func:`canonical_filters`, the same inputs the
+    predicates use, so "2br flat in kilimani" and "two bedroom apartment
+    in kilimani" (or ``max_price`` vs a bare ``price`` budget) share an
+    entry whenever they filter identically.
+    """
+    canonical = canonical_filters(entities)
+    canonical.update({f"_{key}": value for key, value in extra.items() if value is not None})
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+class FilterResultCache:
+    """
+    LRU of matching property ids per canonical filter set.
+
+    Entries remember the catalog version they were computed at and are
+    treated as misses once the catalog has changed.
+    """
+
+    def __init__(self, version: CatalogVersion, max_entries: int = 4096):
+        self.version = version
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, List[str]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != self.version.value:
+            if entry is not None:
+                del self._entries[key]
+            RESULT_CACHE_MISSES.inc()
+            return None
+        self._entries.move_to_end(key)
+        RESULT_CACHE_HITS.inc()
+        return entry[1]
+
+    def put(self, key: str, ids: List[str]) -> None:
+        self._entries[key] = (self.version.value, ids)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -3,9 +3,28 @@ from spacy.matcher import Matcher, PhraseMatcher
 import re
 import asyncio
 import threading
-from typing import Dict, List, Any, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Set
 from concurrent.futures import ThreadPoolExecutor
 import functools
+# Registered by the nlp facade on the event loop thread, not on the import worker
+from nlp import PARSE_CACHE_HITS, PARSE_CACHE_MISSES, PARSE_DURATION
+from gazetteer import KENYAN_LOCATIONS, KENYAN_UNIVERSITIES
+from fuzzy import SymSpellIndex, strict_distance
+
+AMENITY_TERMS = [
+    "wifi", "wi-fi", "wireless", "internet", "broadband",
+    "parking", "garage", "car park", "off-street parking",
+    "pool", "swimming pool", "jacuzzi",
+    "garden", "balcony", "terrace", "patio",
+    "furnished", "unfurnished", "semi-furnished",
+    "air conditioning", "ac", "heating", "cooling",
+    "security", "cctv", "alarm", "gated community",
+    "pet friendly", "pets allowed", "elevator", "lift",
+    "laundry", "washing machine", "dryer",
+    "kitchen", "modern kitchen", "equipped kitchen"
+]
 
 class AsyncPropertyQueryParser:
     """
@@ -19,11 +38,17 @@ class AsyncPropertyQueryParser:
     _phrase_matcher = None
     _kenyan_locations = None
     _kenyan_universities = None
+    _location_speller = None
+    _amenity_speller = None
     _initialized = False
     _lock = threading.Lock()
     
     # Thread pool for CPU-bound operations
     _thread_pool = ThreadPoolExecutor(max_workers=4)
+
+    # LRU of parsed entities keyed by query text, only touched from the event loop
+    _parse_cache = OrderedDict()
+    _parse_cache_size = 1024
     
     @classmethod
     def initialize_parser(cls):
@@ -34,19 +59,18 @@ class AsyncPropertyQueryParser:
                 cls._matcher = Matcher(cls._nlp.vocab)
                 cls._phrase_matcher = PhraseMatcher(cls._nlp.vocab, attr="LOWER")
                 
-                # Common Kenyan locations and universities
-                cls._kenyan_locations = {
-                    'nairobi', 'mombasa', 'kisumu', 'nakuru', 'eldoret', 'thika', 'malindi', 
-                    'lamu', 'naivasha', 'kakamega', 'kisii', 'nyeri', 'meru', 'garissa',
-                    'westlands', 'kileleshwa', 'lavington', 'kilimani', 'karen', 'rongai'
-                }
-                
-                cls._kenyan_universities = {
-                    'university of nairobi', 'kenyatta university', 'moi university', 'jkuat',
-                    'strathmore university', 'mount kenya university', 'technical university',
-                    'murang\'a university', 'kisumu university', 'maseno university', 'jkuat'
-                }
-                
+                cls._kenyan_locations = KENYAN_LOCATIONS
+                cls._kenyan_universities = KENYAN_UNIVERSITIES
+
+                # Typo tolerance for gazetteer names and single-word amenities
+                cls._location_speller = SymSpellIndex()
+                for name in cls._kenyan_locations | cls._kenyan_universities:
+                    cls._location_speller.add_words(name)
+                cls._amenity_speller = SymSpellIndex()
+                for amenity in AMENITY_TERMS:
+                    if " " not in amenity and len(amenity) > 4:
+                        cls._amenity_speller.add(amenity)
+
                 cls._initialize_matchers()
                 cls._initialized = True
     
@@ -105,19 +129,7 @@ class AsyncPropertyQueryParser:
         cls._matcher.add("PROPERTY_TYPE", property_patterns)
         
         # Features/Amenities with phrase matching
-        amenities_list = [
-            "wifi", "wi-fi", "wireless", "internet", "broadband",
-            "parking", "garage", "car park", "off-street parking",
-            "pool", "swimming pool", "jacuzzi",
-            "garden", "balcony", "terrace", "patio",
-            "furnished", "unfurnished", "semi-furnished",
-            "air conditioning", "ac", "heating", "cooling",
-            "security", "cctv", "alarm", "gated community",
-            "pet friendly", "pets allowed", "elevator", "lift",
-            "laundry", "washing machine", "dryer",
-            "kitchen", "modern kitchen", "equipped kitchen"
-        ]
-        amenity_patterns = [cls._nlp.make_doc(amenity) for amenity in amenities_list]
+        amenity_patterns = [cls._nlp.make_doc(amenity) for amenity in AMENITY_TERMS]
         cls._phrase_matcher.add("AMENITY", amenity_patterns)
 
     @staticmethod
@@ -177,8 +189,26 @@ class AsyncPropertyQueryParser:
         
         return entities
 
+    @staticmethod
+    def _is_unknown_word(token) -> bool:
+        """Whether a loose token is worth spell-correcting: proper nouns and words the model doesn't know"""
+        if not token.is_alpha:
+            return False
+        if token.pos_ in ("PROPN", "X"):
+            return True
+        # is_oov only means "unknown" for pipelines that ship word vectors
+        return token.vocab.vectors.shape[0] > 0 and token.is_oov
+
+    @classmethod
+    def _correct_token(cls, speller, token) -> Optional[str]:
+        """Spelling correction for a token outside any captured phrase, or None"""
+        if not cls._is_unknown_word(token):
+            return None
+        corrected = speller.lookup(token.lower_, strict_distance(token.lower_))
+        return corrected[0] if corrected else None
+
     @classmethod
-    def _extract_locations(cls, doc) -> Dict[str, Any]:
+    def _extract_locations(cls, doc, skip_tokens: Set[int] = frozenset()) -> Dict[str, Any]:
         """Enhanced location extraction with better boundary detection"""
         locations = {}
         text_lower = doc.text.lower()
@@ -198,13 +228,23 @@ class AsyncPropertyQueryParser:
                 else:
                     locations['area'] = location_text
         
+        # Misspelled gazetteer names ("nairoby") are invisible to NER and the set lookup
+        if 'city' not in locations and 'landmark' not in locations:
+            for token in doc:
+                if token.i in skip_tokens:
+                    continue
+                corrected = cls._correct_token(cls._location_speller, token)
+                if corrected in cls._kenyan_locations:
+                    locations['city'] = corrected
+                    break
+
         # Enhanced "near" detection with proper boundaries
         near_patterns = [
-            r'near\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
-            r'close to\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
-            r'around\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
-            r'next to\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
-            r'beside\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)'
+            r'\bnear\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
+            r'\bclose to\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
+            r'\baround\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
+            r'\bnext to\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
+            r'\bbeside\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)'
         ]
         
         for pattern in near_patterns:
@@ -212,6 +252,7 @@ class AsyncPropertyQueryParser:
             if match:
                 landmark = match.group(1).strip()
                 landmark = re.sub(r'\s+(with|and|under|for|having).*$', '', landmark).strip()
+                landmark, _ = cls._location_speller.correct_text(landmark)
                 if landmark and len(landmark) > 2:
                     locations['near'] = landmark
                     locations['location_relation'] = 'near'
@@ -219,9 +260,9 @@ class AsyncPropertyQueryParser:
         
         # Extract "in" location with proper boundaries
         in_patterns = [
-            r'in\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
-            r'at\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
-            r'within\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)'
+            r'\bin\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
+            r'\bat\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)',
+            r'\bwithin\s+([^,.\n]+?)(?:\s+with|\s+and|\s+under|\s+for|\s+having|,|\.|$)'
         ]
         
         for pattern in in_patterns:
@@ -229,6 +270,7 @@ class AsyncPropertyQueryParser:
             if match:
                 city_area = match.group(1).strip()
                 city_area = re.sub(r'\s+(with|and|under|for|having).*$', '', city_area).strip()
+                city_area, _ = cls._location_speller.correct_text(city_area)
                 if city_area and len(city_area) > 2:
                     locations['in'] = city_area
                     locations['location_relation'] = 'in'
@@ -284,9 +326,14 @@ class AsyncPropertyQueryParser:
         doc = cls._nlp(text.lower())
         entities = {}
         
+        # Tokens claimed by a matcher are never spell-corrected into something else
+        matches = cls._matcher(doc)
+        phrase_matches = cls._phrase_matcher(doc)
+        matched_tokens = {i for _, start, end in list(matches) + list(phrase_matches) for i in range(start, end)}
+
         # Extract using multiple methods
         regex_entities = cls._extract_with_regex(text)
-        location_entities = cls._extract_locations(doc)
+        location_entities = cls._extract_locations(doc, matched_tokens)
         room_entities = cls._extract_room_types(doc)
         
         # Combine all entities
@@ -294,10 +341,6 @@ class AsyncPropertyQueryParser:
         entities.update(location_entities)
         entities.update(room_entities)
         
-        # Process with matchers
-        matches = cls._matcher(doc)
-        phrase_matches = cls._phrase_matcher(doc)
-        
         # Process standard matcher
         for match_id, start, end in matches:
             rule_name = cls._nlp.vocab.strings[match_id]
@@ -315,26 +358,40 @@ class AsyncPropertyQueryParser:
         # Process amenities
         amenities = []
         for match_id, start, end in phrase_matches:
-            amenity = doc[start:end].text
-            if amenity in ['wi-fi', 'wireless', 'broadband']:
-                amenity = 'wifi'
-            elif amenity in ['garage', 'car park', 'off-street parking']:
-                amenity = 'parking'
-            elif amenity == 'ac':
-                amenity = 'air conditioning'
-            elif amenity == 'lift':
-                amenity = 'elevator'
-            elif amenity == 'pets allowed':
-                amenity = 'pet friendly'
-            
+            amenity = cls._normalize_amenity(doc[start:end].text)
             if amenity not in amenities:
                 amenities.append(amenity)
+
+        # Fall back to spelling correction for words the phrase matcher missed
+        for token in doc:
+            if token.i in matched_tokens or len(token.text) < 5:
+                continue
+            corrected = cls._correct_token(cls._amenity_speller, token)
+            if corrected:
+                amenity = cls._normalize_amenity(corrected)
+                if amenity not in amenities:
+                    amenities.append(amenity)
         
         if amenities:
             entities['amenities'] = amenities
         
         return cls._clean_entities(entities)
 
+    @staticmethod
+    def _normalize_amenity(amenity: str) -> str:
+        """Map amenity synonyms onto one canonical name"""
+        if amenity in ['wi-fi', 'wireless', 'broadband']:
+            return 'wifi'
+        elif amenity in ['garage', 'car park', 'off-street parking']:
+            return 'parking'
+        elif amenity == 'ac':
+            return 'air conditioning'
+        elif amenity == 'lift':
+            return 'elevator'
+        elif amenity == 'pets allowed':
+            return 'pet friendly'
+        return amenity
+
     @staticmethod
     def _clean_entities(entities: Dict[str, Any]) -> Dict[str, Any]:
         """Clean and normalize final entities"""
@@ -372,15 +429,38 @@ class AsyncPropertyQueryParser:
         """
         if not cls._initialized:
             cls.initialize_parser()
-            
+
+        cached = cls._parse_cache.get(text)
+        if cached is not None:
+            PARSE_CACHE_HITS.inc()
+            cls._parse_cache.move_to_end(text)
+            return cls._copy_entities(cached)
+        PARSE_CACHE_MISSES.inc()
+
         # Run the CPU-intensive parsing in thread pool
         loop = asyncio.get_event_loop()
+        start = time.perf_counter()
         result = await loop.run_in_executor(
             cls._thread_pool, 
             cls._parse_query_sync, 
             text
         )
-        return result
+        PARSE_DURATION.observe(time.perf_counter() - start)
+
+        cls._parse_cache[text] = result
+        if len(cls._parse_cache) > cls._parse_cache_size:
+            cls._parse_cache.popitem(last=False)
+        return cls._copy_entities(result)
+
+    @staticmethod
+    def _copy_entities(entities: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy cached entities so callers can't mutate the cache"""
+        return {k: list(v) if isinstance(v, list) else v for k, v in entities.items()}
+
+    @classmethod
+    def executor_queue_depth(cls) -> int:
+        """Number of parse jobs waiting for a free worker thread"""
+        return cls._thread_pool._work_queue.qsize()
 
     @classmethod
     async def parse_multiple_queries(cls, queries: List[str]) -> List[Dict[str, Any]]:
@@ -411,6 +491,7 @@ class AsyncPropertyQueryParser:
             cls._thread_pool.shutdown(wait=True)
 
 
+
 # FastAPI/Async compatible usage
 async def get_query_parser(search_query: str) -> dict:
     """
@@ -0,0 +1,207 @@
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ranking import tokenize
+
+TEXT_FIELDS = {"title": 2.0, "description": 1.0, "property_type": 1.5}
+NUMERIC_FIELDS = ("price", "bedrooms", "square_feet")
+# Prices and floor areas are compared on a log scale
+LOG_FIELDS = frozenset({"price", "square_feet"})
+
+
+def _hash_token(token: str, dims: int) -> int:
+    return zlib.crc32(token.encode()) % dims
+
+
+class SimilarityIndex:
+    """
+    Sparse TF-IDF + numeric features for "more like this" lookups.
+
+    Text is hashed into ``dims`` columns so the vocabulary never has to be
+    known up front. Each listing keeps only its non-zero terms, as a
+    fixed-width row of (column, field-weighted tf) pairs capped at
+    ``max_terms``, so memory grows with listing length rather than ``dims``.
+    Document frequencies and numeric sums are running totals, and idf is
+    applied as a vector at query time, so a write touches one row and
+    that row's norm. Norms of untouched rows drift as idf changes;
+    :meth:`compute_norms` / :meth:`apply_norms` refresh them all and are
+    meant to run off the event loop.
+    """
+
+    def __init__(self, dims: int = 1024, text_weight: float = 0.7, capacity: int = 64, max_terms: int = 48):
+        self.dims = dims
+        self.text_weight = text_weight
+        self.max_terms = max_terms
+        # Column ``dims`` is padding: its idf and query weight stay 0
+        self._pad = dims
+        self._col_dtype = np.int16 if dims < np.iinfo(np.int16).max else np.int32
+        self._cols = np.full((capacity, max_terms), self._pad, dtype=self._col_dtype)
+        self._vals = np.zeros((capacity, max_terms), dtype=np.float32)
+        self._norms = np.ones(capacity, dtype=np.float32)
+        self._numeric = np.zeros((capacity, len(NUMERIC_FIELDS)), dtype=np.float32)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._df = np.zeros(dims + 1, dtype=np.float64)
+        self._numeric_sum = np.zeros(len(NUMERIC_FIELDS), dtype=np.float64)
+        self._numeric_sumsq = np.zeros(len(NUMERIC_FIELDS), dtype=np.float64)
+        self._ids: List[Optional[str]] = [None] * capacity
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._next_row = 0
+        # Rows written since the last full norm refresh started
+        self._dirty: Set[int] = set()
+        self.writes_since_refresh = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def _grow(self) -> None:
+        """Double the row capacity so appends stay amortized O(1)"""
+        old = self._cols.shape[0]
+
+        def grown(array: np.ndarray, fill) -> np.ndarray:
+            bigger = np.full((old * 2,) + array.shape[1:], fill, dtype=array.dtype)
+            bigger[:old] = array
+            return bigger
+
+        self._cols = grown(self._cols, self._pad)
+        self._vals = grown(self._vals, 0)
+        self._norms = grown(self._norms, 1)
+        self._numeric = grown(self._numeric, 0)
+        self._active = grown(self._active, False)
+        self._ids.extend([None] * old)
+
+    def _idf(self, cols: Optional[np.ndarray] = None) -> np.ndarray:
+        """Current idf for all columns, or just for ``cols``"""
+        count = max(len(self._rows), 1)
+        df = self._df if cols is None else self._df[cols]
+        idf = (np.log((1 + count) / (1 + df)) + 1).astype(np.float32)
+        if cols is None:
+            idf[self._pad] = 0
+        else:
+            idf[cols == self._pad] = 0
+        return idf
+
+    def _text_row(self, record: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        weights: Dict[int, float] = {}
+        for field, weight in TEXT_FIELDS.items():
+            for token in tokenize(str(record.get(field, ""))):
+                col = _hash_token(token, self.dims)
+                weights[col] = weights.get(col, 0.0) + weight
+        # Long descriptions keep their heaviest terms
+        terms = sorted(weights.items(), key=lambda item: -item[1])[:self.max_terms]
+        cols = np.full(self.max_terms, self._pad, dtype=self._col_dtype)
+        vals = np.zeros(self.max_terms, dtype=np.float32)
+        for i, (col, value) in enumerate(terms):
+            cols[i], vals[i] = col, value
+        return cols, vals
+
+    @staticmethod
+    def _numeric_row(record: Dict[str, Any]) -> List[float]:
+        values = []
+        for field in NUMERIC_FIELDS:
+            value = float(record.get(field) or 0)
+            values.append(np.log1p(max(value, 0.0)) if field in LOG_FIELDS else value)
+        return values
+
+    def _row_norm(self, row: int) -> float:
+        return float(np.linalg.norm(self._vals[row] * self._idf(self._cols[row])))
+
+    def add(self, key: str, record: Dict[str, Any]) -> None:
+        if key in self._rows:
+            self.remove(key)
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._next_row == self._cols.shape[0]:
+                self._grow()
+            row = self._next_row
+            self._next_row += 1
+        cols, vals = self._text_row(record)
+        self._cols[row], self._vals[row] = cols, vals
+        self._df[cols[vals > 0]] += 1
+        numeric = self._numeric_row(record)
+        self._numeric[row] = numeric
+        self._numeric_sum += numeric
+        self._numeric_sumsq += np.square(numeric)
+        self._active[row] = True
+        self._ids[row] = key
+        self._rows[key] = row
+        self._norms[row] = self._row_norm(row)
+        self._dirty.add(row)
+        self.writes_since_refresh += 1
+
+    def remove(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        cols = self._cols[row]
+        self._df[cols[self._vals[row] > 0]] -= 1
+        numeric = self._numeric[row].astype(np.float64)
+        self._numeric_sum -= numeric
+        self._numeric_sumsq -= np.square(numeric)
+        self._cols[row] = self._pad
+        self._vals[row] = 0
+        self._active[row] = False
+        self._ids[row] = None
+        self._free.append(row)
+        self.writes_since_refresh += 1
+
+    def compute_norms(self) -> Tuple[int, np.ndarray]:
+        """
+        Norms of every row under the current idf.
+
+        Thread-safe with respect to concurrent writes on the event loop:
+        rows written meanwhile are recomputed by :meth:`apply_norms`.
+        Returns ``(used_rows, norms)`` for :meth:`apply_norms`.
+        """
+        self._dirty = set()
+        self.writes_since_refresh = 0
+        used = self._next_row
+        idf = self._idf()
+        cols, vals = self._cols[:used], self._vals[:used]
+        return used, np.linalg.norm(vals * idf[cols], axis=1).astype(np.float32)
+
+    def apply_norms(self, result: Tuple[int, np.ndarray]) -> None:
+        """Install norms from :meth:`compute_norms` (call on the event loop)"""
+        used, norms = result
+        self._norms[:used] = norms
+        for row in self._dirty:
+            self._norms[row] = self._row_norm(row)
+
+    def similar(self, key: str, k: int = 5) -> List[Tuple[str, float]]:
+        """The ``k`` most similar listings to ``key`` as (key, score), best first"""
+        row = self._rows.get(key)
+        if row is None:
+            raise KeyError(key)
+        used = self._next_row
+
+        # Cosine over idf-weighted rows: sum(q_t * idf_t^2 * d_t) / (|q| |d|)
+        idf = self._idf()
+        query = np.zeros(self.dims + 1, dtype=np.float32)
+        query[self._cols[row]] = self._vals[row] * np.square(idf[self._cols[row]])
+        query[self._pad] = 0
+        query_norm = max(self._row_norm(row), 1e-9)
+        dots = (query[self._cols[:used]] * self._vals[:used]).sum(axis=1)
+        text_scores = dots / (np.maximum(self._norms[:used], 1e-9) * query_norm)
+
+        count = max(len(self._rows), 1)
+        mean = self._numeric_sum / count
+        std = np.sqrt(np.maximum(self._numeric_sumsq / count - np.square(mean), 0))
+        std = np.where(std > 0, std, 1.0).astype(np.float32)
+        distances = np.linalg.norm((self._numeric[:used] - self._numeric[row]) / std, axis=1)
+
+        scores = self.text_weight * text_scores + (1 - self.text_weight) / (1 + distances)
+        scores[~self._active[:used]] = -np.inf
+        scores[row] = -np.inf
+
+        k = min(k, len(self._rows) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[i], float(scores[i])) for i in top]
@@ -0,0 +1,148 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from records import NULLABLE_FIELDS, PROPERTY_FIELDS, PropertyRecord, as_record
+from result_cache import CatalogVersion
+
+Listener = Callable[[PropertyRecord], None]
+
+
+class PropertyStore:
+    """
+    The single live property catalog and its built-in lookups.
+
+    Records are kept in an insertion-ordered dict (catalog order) with
+    secondary lookups by type and owner and a sorted price column. Other
+    derived structures (text, facet, spatial indexes...) subscribe to
+    add/remove notifications, so every write updates them incrementally.
+    Records are stored as immutable PropertyRecord rows; updates replace
+    the row rather than mutating it, so lists already handed to in-flight
+    responses never change underneath them.
+    """
+
+    def __init__(self, version: Optional[CatalogVersion] = None):
+        self.version = version if version is not None else CatalogVersion()
+        self._records: Dict[str, PropertyRecord] = {}
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        # (seq, id) lists kept sorted, so lookups return catalog order
+        self._by_type: Dict[str, List[Tuple[int, str]]] = {}
+        self._by_owner: Dict[str, List[Tuple[int, str]]] = {}
+        self._prices: List[Tuple[int, int, str]] = []
+        self._created: List[Tuple[float, int, str]] = []
+        self._on_add: List[Listener] = []
+        self._on_remove: List[Listener] = []
+
+    def subscribe(self, on_add: Listener, on_remove: Listener) -> None:
+        self._on_add.append(on_add)
+        self._on_remove.append(on_remove)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, prop_id: str) -> bool:
+        return prop_id in self._records
+
+    def __iter__(self) -> Iterator[PropertyRecord]:
+        return iter(self._records.values())
+
+    def values(self):
+        """Live view of all records in catalog order (no copy)"""
+        return self._records.values()
+
+    def get(self, prop_id: str) -> Optional[PropertyRecord]:
+        return self._records.get(prop_id)
+
+    @staticmethod
+    def _discard(entries: List[tuple], entry: tuple) -> None:
+        index = bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
+
+    def _index(self, prop: PropertyRecord) -> None:
+        prop_id = prop["id"]
+        seq = self._seq[prop_id]
+        insort(self._by_type.setdefault(prop["property_type"].lower(), []), (seq, prop_id))
+        insort(self._by_owner.setdefault(prop["owner_id"], []), (seq, prop_id))
+        insort(self._prices, (prop["price"], seq, prop_id))
+        insort(self._created, (prop.created_ts, seq, prop_id))
+        for listener in self._on_add:
+            listener(prop)
+
+    def _unindex(self, prop: PropertyRecord) -> None:
+        prop_id = prop["id"]
+        seq = self._seq[prop_id]
+        for lookup, key in ((self._by_type, prop["property_type"].lower()), (self._by_owner, prop["owner_id"])):
+            members = lookup.get(key)
+            if members is not None:
+                self._discard(members, (seq, prop_id))
+                if not members:
+                    del lookup[key]
+        self._discard(self._prices, (prop["price"], seq, prop_id))
+        self._discard(self._created, (prop.created_ts, seq, prop_id))
+        for listener in self._on_remove:
+            listener(prop)
+
+    def add(self, prop: Dict[str, Any]) -> PropertyRecord:
+        prop = as_record(prop)
+        prop_id = prop["id"]
+        if prop_id in self._records:
+            raise KeyError(f"Property already exists: {prop_id}")
+        self._records[prop_id] = prop
+        self._seq[prop_id] = self._next_seq
+        self._next_seq += 1
+        self._index(prop)
+        self.version.bump()
+        return prop
+
+    def add_many(self, props: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        for prop in props:
+            self.add(prop)
+            count += 1
+        return count
+
+    def update(self, prop_id: str, changes: Dict[str, Any]) -> PropertyRecord:
+        old = self._records[prop_id]
+        new = PropertyRecord.from_dict({**old, **changes, "id": prop_id})
+        # Check the new row before touching any index, so a bad update
+        # leaves the old record fully in place
+        missing = [field for field in PROPERTY_FIELDS if new[field] is None and field not in NULLABLE_FIELDS]
+        if missing:
+            raise ValueError(f"Fields cannot be null: {', '.join(missing)}")
+        self._unindex(old)
+        # Assigning an existing key keeps the record's catalog position
+        self._records[prop_id] = new
+        self._index(new)
+        self.version.bump()
+        return new
+
+    def remove(self, prop_id: str) -> PropertyRecord:
+        prop = self._records[prop_id]
+        self._unindex(prop)
+        del self._records[prop_id]
+        del self._seq[prop_id]
+        self.version.bump()
+        return prop
+
+    def by_type(self, property_type: str) -> List[PropertyRecord]:
+        members = self._by_type.get(property_type.lower(), ())
+        return [self._records[key] for _, key in members]
+
+    def by_owner(self, owner_id: str) -> List[PropertyRecord]:
+        members = self._by_owner.get(owner_id, ())
+        return [self._records[key] for _, key in members]
+
+    def in_price_range(self, min_price: Optional[int] = None, max_price: Optional[int] = None) -> List[PropertyRecord]:
+        """Records with min_price <= price <= max_price, in catalog order"""
+        lo = 0 if min_price is None else bisect_left(self._prices, (min_price,))
+        hi = len(self._prices) if max_price is None else bisect_right(self._prices, (max_price, float("inf")))
+        entries = sorted(self._prices[lo:hi], key=lambda entry: entry[1])
+        return [self._records[prop_id] for _, _, prop_id in entries]
+
+    def created_between(self, after: Optional[float] = None, before: Optional[float] = None) -> List[PropertyRecord]:
+        """Records with after <= created_ts < before (epoch seconds), in catalog order"""
+        lo = 0 if after is None else bisect_left(self._created, (after,))
+        hi = len(self._created) if before is None else bisect_left(self._created, (before,))
+        entries = sorted(self._created[lo:hi], key=lambda entry: entry[1])
+        return [self._records[prop_id] for _, _, prop_id in entries]
@@ -0,0 +1,216 @@
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from gazetteer import LANDMARK_COORDINATES
+
+# Neighbourhoods listings are spread over, with a relative listing weight
+# and a price multiplier (upmarket estates cost more than satellite towns)
+AREAS: List[Tuple[str, str, float, float]] = [
+    ("kilimani", "Kilimani, Nairobi", 10, 1.6),
+    ("westlands", "Westlands, Nairobi", 9, 1.8),
+    ("kileleshwa", "Kileleshwa, Nairobi", 7, 1.7),
+    ("lavington", "Lavington, Nairobi", 5, 2.0),
+    ("karen", "Karen, Nairobi", 4, 2.6),
+    ("rongai", "Rongai, Kajiado", 8, 0.7),
+    ("nairobi", "Nairobi CBD", 6, 1.2),
+    ("thika", "Thika, Kiambu", 6, 0.6),
+    ("mombasa", "Nyali, Mombasa", 6, 1.4),
+    ("malindi", "Malindi, Kilifi", 2, 1.3),
+    ("kisumu", "Milimani, Kisumu", 5, 0.9),
+    ("nakuru", "Milimani, Nakuru", 4, 0.8),
+    ("eldoret", "Elgon View, Eldoret", 3, 0.8),
+    ("naivasha", "Naivasha, Nakuru", 2, 1.0),
+    ("nyeri", "Nyeri Town", 2, 0.7),
+    ("jkuat", "Juja, Kiambu", 5, 0.5),
+    ("kenyatta university", "Kahawa, Nairobi", 5, 0.6),
+]
+
+# property_type -> (listing weight, bedroom range, base price in KES)
+PROPERTY_TYPES: Dict[str, Tuple[float, Tuple[int, int], int]] = {
+    "Apartment": (40, (1, 4), 6_500_000),
+    "Bedsitter": (12, (0, 0), 1_800_000),
+    "Studio": (10, (1, 1), 3_200_000),
+    "Townhouse": (10, (3, 5), 14_000_000),
+    "Maisonette": (10, (3, 5), 12_000_000),
+    "Bungalow": (10, (2, 5), 11_000_000),
+    "Villa": (5, (4, 6), 35_000_000),
+    "Penthouse": (3, (3, 5), 30_000_000),
+}
+
+AMENITIES = [
+    "wifi", "parking", "swimming pool", "gym", "garden", "balcony", "terrace",
+    "furnished", "air conditioning", "cctv", "gated community", "borehole",
+    "backup generator", "elevator", "laundry", "modern kitchen", "pet friendly",
+    "servant quarters", "solar water heating", "electric fence",
+]
+
+TITLE_STYLES = ["Modern", "Spacious", "Cozy", "Elegant", "Affordable", "Executive",
+                "Serene", "Newly Built", "Luxury", "Family"]
+
+FIRST_NAMES = ["Wanjiku", "Otieno", "Achieng", "Kamau", "Njeri", "Mutua", "Wambui",
+               "Kipchoge", "Chebet", "Omondi", "Akinyi", "Mwangi", "Auma", "Kiprop",
+               "Nyambura", "Ouma", "Wairimu", "Kibet", "Atieno", "Githinji"]
+LAST_NAMES = ["Kariuki", "Odhiambo", "Njoroge", "Mutiso", "Wekesa", "Cheruiyot",
+              "Onyango", "Maina", "Kiplagat", "Were", "Nyaga", "Ochieng", "Kimani",
+              "Barasa", "Koech", "Wafula", "Gitau", "Owino", "Macharia", "Rotich"]
+ROLES = [("user", 80), ("premium", 15), ("agent", 4), ("admin", 1)]
+
+POST_TOPICS = ["Buying", "Renting", "Renovating", "Financing", "Furnishing", "Selling"]
+POST_CATEGORIES = ["Home Buying", "Renting", "Renovation", "Investment", "Interior Design", "Tips"]
+
+IMAGES = [
+    "https://images.unsplash.com/photo-1512917774080-9991f1c4c750?w=600&h=400&fit=crop",
+    "https://images.unsplash.com/photo-1545324418-cc1a3fa10c00?w=600&h=400&fit=crop",
+    "https://images.unsplash.com/photo-1522708323590-d24dbb6b0267?w=600&h=400&fit=crop",
+    "https://images.unsplash.com/photo-1568605114967-8130f3a36994?w=600&h=400&fit=crop",
+    "https://images.unsplash.com/photo-1570129477492-45c003edd2be?w=600&h=400&fit=crop",
+]
+
+EPOCH = datetime(2023, 1, 1)
+
+
+def user_id(index: int) -> str:
+    return f"syn-u{index}"
+
+
+def batched(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Chunk a record stream for loaders that take lists"""
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class SyntheticCatalog:
+    """
+    Deterministic generator of realistic users, posts and properties.
+
+    Each record kind draws from its own RNG seeded from ``seed``, so the
+    same seed always yields the same catalog regardless of which kinds are
+    generated or in what order. Everything is produced lazily from
+    generators; nothing proportional to the record count is held in memory.
+    """
+
+    def __init__(self, seed: int = 42, start: datetime = EPOCH, span_days: int = 720):
+        self.seed = seed
+        self.start = start
+        self.span_seconds = span_days * 86400
+        self._area_weights = [area[2] for area in AREAS]
+        self._type_names = list(PROPERTY_TYPES)
+        self._type_weights = [PROPERTY_TYPES[name][0] for name in self._type_names]
+
+    def _rng(self, kind: str) -> random.Random:
+        return random.Random(f"{self.seed}:{kind}")
+
+    def _timestamp(self, rng: random.Random, index: int, count: int) -> str:
+        # Spread records evenly over the span so creation order follows index order
+        offset = self.span_seconds * index / max(count, 1) + rng.uniform(0, 60)
+        return (self.start + timedelta(seconds=offset)).isoformat(timespec="seconds")
+
+    @staticmethod
+    def _owner(rng: random.Random, owners: Union[int, Sequence[str]]) -> str:
+        if isinstance(owners, int):
+            return user_id(rng.randrange(owners))
+        return rng.choice(owners)
+
+    def users(self, count: int) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("users")
+        roles, role_weights = zip(*ROLES)
+        for i in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            area = rng.choices(AREAS, weights=self._area_weights)[0]
+            yield {
+                "id": user_id(i),
+                "name": f"{first} {last}",
+                "email": f"{first.lower()}.{last.lower()}{i}@example.co.ke",
+                "created_at": self._timestamp(rng, i, count),
+                "role": rng.choices(roles, weights=role_weights)[0],
+                "avatar": "",
+                "bio": f"Looking for a home around {area[1]}.",
+                "location": area[1],
+                "phone": f"+254 7{rng.randrange(10**8):08d}",
+            }
+
+    def posts(self, count: int, authors: Union[int, Sequence[str]]) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("posts")
+        for i in range(count):
+            topic = rng.choice(POST_TOPICS)
+            area = rng.choices(AREAS, weights=self._area_weights)[0]
+            # Engagement is heavy-tailed: most posts get a little, a few go viral
+            likes = min(int(rng.paretovariate(1.2) * 5) - 5, 100_000)
+            yield {
+                "id": f"syn-post{i}",
+                "title": f"{topic} in {area[1]}: what I learned",
+                "content": f"Notes from {topic.lower()} a home in {area[1]}, including costs, "
+                           f"agents and what to check before signing.",
+                "author": self._owner(rng, authors),
+                "created_at": self._timestamp(rng, i, count),
+                "image": rng.choice(IMAGES),
+                "category": rng.choice(POST_CATEGORIES),
+                "likes": likes,
+                "comments": int(likes * rng.uniform(0.1, 0.5)),
+            }
+
+    def properties(self, count: int, owners: Union[int, Sequence[str]]) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("properties")
+        for i in range(count):
+            landmark, location, _, area_factor = rng.choices(AREAS, weights=self._area_weights)[0]
+            property_type = rng.choices(self._type_names, weights=self._type_weights)[0]
+            _, (min_beds, max_beds), base_price = PROPERTY_TYPES[property_type]
+            bedrooms = rng.randint(min_beds, max_beds)
+            lat, lng = LANDMARK_COORDINATES[landmark]
+            amenities = rng.sample(AMENITIES, rng.randint(2, 6))
+            style = rng.choice(TITLE_STYLES)
+            room_label = f"{bedrooms} Bedroom " if bedrooms else ""
+            price = base_price * area_factor * (1 + 0.25 * max(bedrooms - 1, 0))
+            yield {
+                "id": f"syn-p{i}",
+                "title": f"{style} {room_label}{property_type} in {location.split(',')[0]}",
+                "description": f"{style} {property_type.lower()} in {location} with "
+                               f"{', '.join(amenities[:-1])} and {amenities[-1]}.",
+                "price": int(round(price * rng.lognormvariate(0, 0.25), -3)),
+                "location": location,
+                # Jitter of roughly 1-3 km around the neighbourhood centre
+                "latitude": round(lat + rng.gauss(0, 0.015), 5),
+                "longitude": round(lng + rng.gauss(0, 0.015), 5),
+                "bedrooms": bedrooms,
+                "bathrooms": max(1, bedrooms - rng.randint(0, 1)),
+                "square_feet": int(round((350 + 420 * bedrooms) * rng.uniform(0.8, 1.3), -1)),
+                "property_type": property_type,
+                "year_built": rng.randint(1985, 2025),
+                "owner_id": self._owner(rng, owners),
+                "created_at": self._timestamp(rng, i, count),
+                "image": rng.choice(IMAGES),
+            }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a synthetic catalog as JSON lines")
+    parser.add_argument("kind", choices=["users", "posts", "properties"])
+    parser.add_argument("count", type=int)
+    parser.add_argument("--users", type=int, default=1000, help="Number of synthetic users records refer to")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    catalog = SyntheticCatalog(seed=args.seed)
+    if args.kind == "users":
+        records = catalog.users(args.count)
+    elif args.kind == "posts":
+        records = catalog.posts(args.count, args.users)
+    else:
+        records = catalog.properties(args.count, args.users)
+    write = sys.stdout.write
+    for record in records:
+        write(json.dumps(record))
+        write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from bisect import bisect_left, insort
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from records import to_epoch
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def bound_to_epoch(value: Optional[Union[datetime, date]]) -> Optional[float]:
+    """
+    Query bound -> epoch seconds comparable with stored timestamps.
+
+    A bare date means midnight. Stored timestamps are naive server-local
+    times (``datetime.now()``), so aware bounds are converted to the
+    server's local time zone first.
+    """
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH).total_seconds()
+
+
+def in_range(ts: float, after: Optional[float], before: Optional[float]) -> bool:
+    return (after is None or ts >= after) and (before is None or ts < before)
+
+
+class TimeIndex:
+    """
+    Keys sorted by creation time, for created_after/created_before filters.
+
+    Timestamps are parsed once on insert; a range query is two bisects
+    and a slice instead of parsing or comparing ISO strings per record.
+    Ranges are half-open: ``after <= t < before``.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[float, int, str]] = []
+        self._keys: Dict[str, Tuple[float, int, str]] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, created_at: str) -> None:
+        if key in self._keys:
+            self.remove(key)
+        entry = (to_epoch(created_at), self._next_seq, key)
+        self._next_seq += 1
+        self._keys[key] = entry
+        # Seeded and newly created records mostly arrive in time order,
+        # which makes insort an append
+        insort(self._entries, entry)
+
+    def add_many(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self.add(record["id"], record["created_at"])
+
+    def remove(self, key: str) -> None:
+        entry = self._keys.pop(key, None)
+        if entry is None:
+            return
+        index = bisect_left(self._entries, entry)
+        if index < len(self._entries) and self._entries[index] == entry:
+            del self._entries[index]
+
+    def timestamp(self, key: str) -> Optional[float]:
+        entry = self._keys.get(key)
+        return entry[0] if entry else None
+
+    def _bounds(self, after: Optional[float], before: Optional[float]) -> Tuple[int, int]:
+        lo = 0 if after is None else bisect_left(self._entries, (after,))
+        hi = len(self._entries) if before is None else bisect_left(self._entries, (before,))
+        return lo, max(lo, hi)
+
+    def count(self, after: Optional[float] = None, before: Optional[float] = None) -> int:
+        lo, hi = self._bounds(after, before)
+        return hi - lo
+
+    def between(self, after: Optional[float] = None, before: Optional[float] = None) -> Iterator[str]:
+        """Keys created in [after, before), oldest first"""
+        lo, hi = self._bounds(after, before)
+        return (key for _, _, key in self._entries[lo:hi])
@@ -0,0 +1,122 @@
+import re
+from typing import Dict, List, Optional
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text.strip().lower())
+
+
+class _Node:
+    __slots__ = ("children", "top", "term")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # Best terms in this subtree, highest weight first
+        self.top: List[str] = []
+        # Set when a suggestion ends at this node
+        self.term: Optional[str] = None
+
+
+class SuggestionTrie:
+    """
+    Prefix trie for typeahead where every node caches its top-k terms.
+
+    A lookup walks the prefix and returns the cached list, so answering a
+    keystroke costs O(len(prefix)) regardless of catalog size. Raising a
+    term's weight updates the caches along its path in O(depth * k);
+    lowering one rebuilds them from the children's caches.
+    """
+
+    def __init__(self, top_k: int = 10):
+        self.top_k = top_k
+        self._root = _Node()
+        self._weights: Dict[str, float] = {}
+        self._display: Dict[str, str] = {}
+        self._kinds: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def __contains__(self, text: str) -> bool:
+        return normalize(text) in self._weights
+
+    def _path(self, term: str, create: bool) -> Optional[List[_Node]]:
+        node = self._root
+        path = [node]
+        for char in term:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = _Node()
+            node = child
+            path.append(node)
+        return path
+
+    def _rank_key(self, term: str):
+        return (-self._weights[term], term)
+
+    def add(self, text: str, weight: float = 1.0, kind: str = "term") -> None:
+        """Add a suggestion or raise its weight if it already exists"""
+        term = normalize(text)
+        if not term:
+            return
+        self._display.setdefault(term, text.strip())
+        self._kinds.setdefault(term, kind)
+        self._weights[term] = self._weights.get(term, 0.0) + weight
+
+        path = self._path(term, create=True)
+        path[-1].term = term
+        if weight >= 0:
+            for node in path:
+                self._promote(node, term)
+        else:
+            self._rebuild(path)
+
+    def discard(self, text: str, weight: float = 1.0) -> None:
+        """Lower a suggestion's weight, dropping it once nothing references it"""
+        term = normalize(text)
+        current = self._weights.get(term)
+        if current is None:
+            return
+        path = self._path(term, create=False)
+        remaining = current - weight
+        if remaining > 0:
+            self._weights[term] = remaining
+        else:
+            del self._weights[term]
+            del self._display[term]
+            del self._kinds[term]
+            path[-1].term = None
+        self._rebuild(path)
+
+    def _promote(self, node: _Node, term: str) -> None:
+        top = node.top
+        if term in top:
+            top.sort(key=self._rank_key)
+            return
+        if len(top) < self.top_k or self._rank_key(term) < self._rank_key(top[-1]):
+            top.append(term)
+            top.sort(key=self._rank_key)
+            del top[self.top_k:]
+
+    def _rebuild(self, path: List[_Node]) -> None:
+        # Walk back up so every node merges already-updated child caches
+        for node in reversed(path):
+            candidates = set()
+            if node.term is not None:
+                candidates.add(node.term)
+            for child in node.children.values():
+                candidates.update(child.top)
+            node.top = sorted(candidates, key=self._rank_key)[:self.top_k]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, object]]:
+        path = self._path(normalize(prefix), create=False)
+        if path is None:
+            return []
+        return [
+            {"text": self._display[term], "kind": self._kinds[term], "score": self._weights[term]}
+            for term in path[-1].top[:limit]
+        ]